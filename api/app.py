@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 import structlog
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from paperbanana.core.config import Settings
@@ -17,27 +20,62 @@ from .tasks import TaskManager
 
 logger = structlog.get_logger()
 
+_TERMINAL_EVENTS = frozenset({"completed", "failed"})
+_FINISHED = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
 
-def _patch_genai_aclose():
-    """Monkey-patch google-genai BaseApiClient.aclose to suppress
-    '_async_httpx_client' AttributeError during garbage collection."""
-    try:
-        from google.genai import _api_client
+# Completed task images never change for a given task_id
+_IMAGE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Task submissions allowed per client address per window
+_SUBMIT_LIMIT = 30
+_SUBMIT_WINDOW = 60.0
+
+
+class _RateLimiter:
+    """Fixed-window request counter keyed by client address.
+
+    Counts are reset wholesale at each window boundary, so memory is bounded
+    by the number of distinct clients seen within one window.
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._window_start = time.monotonic()
+        self._counts: dict[str, int] = {}
 
-        _original_aclose = _api_client.BaseApiClient.aclose
+    def allow(self, key: str) -> bool:
+        """Count a request from ``key`` and report whether it is within the limit."""
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._counts.clear()
+        count = self._counts.get(key, 0)
+        if count >= self.limit:
+            return False
+        self._counts[key] = count + 1
+        return True
 
-        async def _safe_aclose(self):
-            try:
-                await _original_aclose(self)
-            except AttributeError:
-                pass
 
-        _api_client.BaseApiClient.aclose = _safe_aclose
-    except Exception:
-        pass
+_submit_limiter = _RateLimiter(_SUBMIT_LIMIT, _SUBMIT_WINDOW)
 
 
-_patch_genai_aclose()
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an ``If-None-Match`` header value against a strong ETag."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _sha256_file(path: Path) -> str:
+    """Hex SHA-256 of a file's contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 _task_manager: TaskManager | None = None
 
@@ -58,12 +96,19 @@ async def lifespan(app: FastAPI):
         env_file_exists=Path(".env").exists(),
     )
 
+    # Start new tasks eagerly so they run up to their first await in the
+    # current loop iteration (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     settings = Settings()
-    _task_manager = TaskManager(settings)
 
-    # Ensure outputs directory exists
+    # Ensure outputs directory exists; it also holds the task database
     Path(settings.output_dir).mkdir(parents=True, exist_ok=True)
 
+    _task_manager = TaskManager(settings, db_path=Path(settings.output_dir) / "tasks.db")
+    await _task_manager.start()
+
     logger.info(
         "API started",
         vlm_provider=settings.vlm_provider,
@@ -72,6 +117,7 @@ async def lifespan(app: FastAPI):
     )
     yield
     logger.info("API shutting down")
+    await _task_manager.close()
 
 
 app = FastAPI(
@@ -95,14 +141,21 @@ async def health_check():
 
 
 @app.post("/api/v1/generate", response_model=TaskCreateResponse, status_code=202)
-async def create_generation_task(request: GenerateRequest):
+async def create_generation_task(request: GenerateRequest, http_request: Request):
     """Submit a new diagram generation task.
 
-    Returns immediately with a task ID. Poll the status URL for progress.
+    Returns immediately with a task ID. Poll the status URL, or subscribe to
+    ``/api/v1/tasks/{task_id}/events``, for progress.
     """
     assert _task_manager is not None
-    task_id = _task_manager.submit(request)
-    return TaskCreateResponse(
+    client = http_request.client.host if http_request.client else "unknown"
+    if not _submit_limiter.allow(client):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded, retry later")
+    try:
+        task_id = _task_manager.submit(request)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="Too many pending tasks, retry later")
+    return TaskCreateResponse.model_construct(
         task_id=task_id,
         status=TaskStatus.PENDING,
         status_url=f"/api/v1/tasks/{task_id}",
@@ -111,13 +164,19 @@ async def create_generation_task(request: GenerateRequest):
 
 @app.get("/api/v1/tasks/{task_id}", response_model=TaskResponse)
 async def get_task_status(task_id: str):
-    """Get the status of a generation task."""
+    """Get the status of a generation task.
+
+    Responses for finished tasks are serialized once and then reused.
+    """
     assert _task_manager is not None
-    state = _task_manager.get(task_id)
+    state = await _task_manager.get(task_id)
     if state is None:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
-    return TaskResponse(
+    if state.response_json is not None:
+        return Response(content=state.response_json, media_type="application/json")
+
+    response = TaskResponse.model_construct(
         task_id=state.task_id,
         status=state.status,
         created_at=state.created_at,
@@ -126,13 +185,54 @@ async def get_task_status(task_id: str):
         result=state.result,
         error=state.error,
     )
+    if state.status in _FINISHED:
+        # Finished tasks never change again: serialize once, serve the bytes
+        state.response_json = response.model_dump_json().encode()
+        return Response(content=state.response_json, media_type="application/json")
+    return response
+
+
+@app.get("/api/v1/tasks/{task_id}/events")
+async def stream_task_events(task_id: str):
+    """Stream task progress as Server-Sent Events.
+
+    Emits ``progress`` events while the task runs and closes the stream after
+    a final ``completed`` or ``failed`` event.
+    """
+    assert _task_manager is not None
+    state = await _task_manager.get(task_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+
+    async def event_stream():
+        queue = state.subscribe()
+        try:
+            # Replay the latest event so late subscribers start from current state
+            event = state.last_event or await queue.get()
+            while True:
+                name, data = event
+                yield f"event: {name}\ndata: {data}\n\n"
+                if name in _TERMINAL_EVENTS:
+                    return
+                event = await queue.get()
+        finally:
+            state.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @app.get("/api/v1/tasks/{task_id}/image")
-async def get_task_image(task_id: str):
-    """Download the generated image for a completed task."""
+async def get_task_image(task_id: str, request: Request):
+    """Download the generated image for a completed task.
+
+    Responses carry a strong ETag; a matching ``If-None-Match`` gets a 304.
+    """
     assert _task_manager is not None
-    state = _task_manager.get(task_id)
+    state = await _task_manager.get(task_id)
     if state is None:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
@@ -146,11 +246,25 @@ async def get_task_image(task_id: str):
         image_path = str(Path("outputs") / state.result.run_id / "final_output.png")
 
     path = Path(image_path)
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="Image file not found")
+    if state.image_stat is None or state.etag is None:
+        # Stat and hash once per task; images never change after completion.
+        # Both are published together, after the awaits, so a concurrent
+        # request never sees a stat without its ETag
+        try:
+            image_stat = await asyncio.to_thread(path.stat)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Image file not found")
+        etag = f'"{await asyncio.to_thread(_sha256_file, path)}"'
+        state.image_stat, state.etag = image_stat, etag
+
+    headers = {"ETag": state.etag, "Cache-Control": _IMAGE_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), state.etag):
+        return Response(status_code=304, headers=headers)
 
     return FileResponse(
         path=str(path),
         media_type="image/png",
         filename=f"{state.task_id}.png",
+        headers=headers,
+        stat_result=state.image_stat,
     )
@@ -6,12 +6,18 @@ import datetime
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Schemas are immutable once parsed. Outbound models are built from trusted
+# server state with ``model_construct`` to skip re-validation.
+_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
 
 
 class GenerateRequest(BaseModel):
     """Request body for POST /api/v1/generate."""
 
+    model_config = _MODEL_CONFIG
+
     source_context: str = Field(description="Methodology text or paper excerpt")
     communicative_intent: str = Field(description="Figure caption / what to communicate")
     diagram_type: str = Field(default="methodology", description="methodology | statistical_plot")
@@ -35,6 +41,8 @@ class TaskStatus(str, Enum):
 class TaskResult(BaseModel):
     """Result payload when a task completes successfully."""
 
+    model_config = _MODEL_CONFIG
+
     image_url: str = Field(description="URL path to download the generated image")
     run_id: str
     description: str = Field(description="Final optimized description")
@@ -45,6 +53,8 @@ class TaskResult(BaseModel):
 class TaskResponse(BaseModel):
     """Response for GET /api/v1/tasks/{task_id}."""
 
+    model_config = _MODEL_CONFIG
+
     task_id: str
     status: TaskStatus
     created_at: datetime.datetime
@@ -57,6 +67,8 @@ class TaskResponse(BaseModel):
 class TaskCreateResponse(BaseModel):
     """Response for POST /api/v1/generate (202 Accepted)."""
 
+    model_config = _MODEL_CONFIG
+
     task_id: str
     status: TaskStatus = TaskStatus.PENDING
     status_url: str
@@ -0,0 +1,128 @@
+"""SQLite persistence for PaperBanana API task state."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    completed_at REAL,
+    progress TEXT,
+    request_json TEXT NOT NULL,
+    result_json TEXT,
+    error TEXT
+)
+"""
+
+_COLUMNS = (
+    "task_id",
+    "status",
+    "created_at",
+    "completed_at",
+    "progress",
+    "request_json",
+    "result_json",
+    "error",
+)
+
+_UPSERT = (
+    f"INSERT OR REPLACE INTO tasks ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+
+class TaskStore:
+    """On-disk task table in WAL mode.
+
+    All database work runs on a single dedicated thread, so the connection is
+    never shared across threads and the event loop never blocks on disk I/O.
+    Rows are plain dicts keyed by column name.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-store")
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def open(self) -> int:
+        """Open the database and fail tasks interrupted by a previous shutdown.
+
+        Returns:
+            Number of tasks marked as interrupted.
+        """
+        return await self._call(self._open)
+
+    def _open(self) -> int:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        cursor = conn.execute(
+            "UPDATE tasks SET status = 'failed', error = ?, completed_at = ?, progress = NULL "
+            "WHERE status IN ('pending', 'running')",
+            ("Interrupted by server restart", time.time()),
+        )
+        conn.commit()
+        self._conn = conn
+        return cursor.rowcount
+
+    async def save(self, row: dict[str, Any]) -> None:
+        """Insert or replace a task row."""
+        await self._call(self._save, tuple(row[c] for c in _COLUMNS))
+
+    def save_nowait(self, row: dict[str, Any]) -> Future:
+        """Queue an insert-or-replace without awaiting it, for synchronous callers.
+
+        The store thread runs work in submission order, so a row queued here
+        is written before any save or load requested after it.
+        """
+        return self._executor.submit(self._save, tuple(row[c] for c in _COLUMNS))
+
+    def _save(self, values: tuple) -> None:
+        self._conn.execute(_UPSERT, values)
+        self._conn.commit()
+
+    async def load(self, task_id: str) -> Optional[dict[str, Any]]:
+        """Fetch a task row by ID."""
+        return await self._call(self._load, task_id)
+
+    def _load(self, task_id: str) -> Optional[dict[str, Any]]:
+        row = self._conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row is not None else None
+
+    async def delete_finished_before(self, cutoff: float) -> int:
+        """Delete finished tasks completed before ``cutoff`` (a Unix timestamp).
+
+        Returns:
+            Number of rows deleted.
+        """
+        return await self._call(self._delete_finished_before, cutoff)
+
+    def _delete_finished_before(self, cutoff: float) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM tasks WHERE status IN ('completed', 'failed') AND completed_at < ?",
+            (cutoff,),
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    async def close(self) -> None:
+        """Close the database and stop the store thread."""
+        if self._conn is not None:
+            await self._call(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
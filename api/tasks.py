@@ -4,41 +4,57 @@ from __future__ import annotations
 
 import asyncio
 import datetime
-import uuid
-from typing import Optional
+import itertools
+import json
+import os
+import secrets
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Optional
 
 import structlog
 
 from paperbanana.core.config import Settings
 from paperbanana.core.pipeline import PaperBananaPipeline
 from paperbanana.core.types import DiagramType, GenerationInput
+from paperbanana.providers.http import create_http_client
 
 from .schemas import GenerateRequest, TaskResult, TaskStatus
+from .store import TaskStore
 
 logger = structlog.get_logger()
 
 _MAX_CONCURRENT = 3
+_MAX_QUEUED = 256
 
+# Retention of task state: finished tasks expire after _TASK_TTL seconds. At
+# most _MAX_TASKS states are held in memory; once full, the least recently used
+# finished task is evicted (it stays readable from the task store, if any).
+_MAX_TASKS = 1_000
+_TASK_TTL = 3600.0
+_SWEEP_INTERVAL = 60.0
 
-def _cleanup_genai_client(pipeline: PaperBananaPipeline) -> None:
-    """Eagerly close the google-genai sync httpx client to suppress spurious
-    ``_async_httpx_client`` errors during garbage collection."""
-    try:
-        for provider in (getattr(pipeline, "_vlm", None), getattr(pipeline, "_image_gen", None)):
-            client = getattr(provider, "_client", None)
-            if client is None:
-                continue
-            api_client = getattr(client, "_api_client", None)
-            if api_client is None:
-                continue
-            httpx_client = getattr(api_client, "_httpx_client", None)
-            if httpx_client is not None:
-                httpx_client.close()
-            # Prevent aclose() from failing on a missing attr
-            if not hasattr(api_client, "_async_httpx_client"):
-                api_client._async_httpx_client = None
-    except Exception:
-        pass
+_FINISHED = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
+
+
+def _pool_key(settings: Settings) -> int:
+    """Key pooled pipelines by the settings that shape their providers and runs."""
+    return hash(
+        (
+            settings.vlm_provider,
+            settings.vlm_model,
+            settings.vlm_image_format,
+            settings.image_provider,
+            settings.image_model,
+            settings.refinement_iterations,
+        )
+    )
+
+
+def _trim_request(request: GenerateRequest) -> GenerateRequest:
+    """Drop the large inputs of a finished task's request."""
+    return request.model_copy(update={"source_context": "", "raw_data": None})
 
 
 class TaskState:
@@ -53,89 +69,300 @@ class TaskState:
         self.progress: Optional[str] = None
         self.result: Optional[TaskResult] = None
         self.error: Optional[str] = None
+        # Result image stat and strong ETag, computed on first download
+        self.image_stat: Optional[os.stat_result] = None
+        self.etag: Optional[str] = None
+        # Serialized status response, cached once the task has finished
+        self.response_json: Optional[bytes] = None
+        # Most recent (event, json_data) pair, replayed to new subscribers
+        self.last_event: Optional[tuple[str, str]] = None
+        self._subscribers: list[asyncio.Queue[tuple[str, str]]] = []
+
+    def subscribe(self) -> asyncio.Queue[tuple[str, str]]:
+        """Register a queue that receives every event published from now on."""
+        queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[tuple[str, str]]) -> None:
+        """Stop delivering events to a queue returned by :meth:`subscribe`."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def publish(self, event: str, **data: Any) -> None:
+        """Record an event and fan it out to all live subscribers."""
+        self.last_event = (event, json.dumps(data, default=str))
+        for queue in self._subscribers:
+            queue.put_nowait(self.last_event)
+
+    def set_progress(self, message: str) -> None:
+        """Update the progress message and notify subscribers."""
+        self.progress = message
+        self.publish("progress", progress=message)
+
+    def to_row(self) -> dict[str, Any]:
+        """Serialize this state into a :class:`TaskStore` row."""
+        return {
+            "task_id": self.task_id,
+            "status": self.status.value,
+            "created_at": self.created_at.timestamp(),
+            "completed_at": self.completed_at.timestamp() if self.completed_at else None,
+            "progress": self.progress,
+            "request_json": self.request.model_dump_json(),
+            "result_json": self.result.model_dump_json() if self.result else None,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> TaskState:
+        """Rebuild a state from a :class:`TaskStore` row."""
+        state = cls(row["task_id"], GenerateRequest.model_validate_json(row["request_json"]))
+        state.status = TaskStatus(row["status"])
+        state.created_at = _from_timestamp(row["created_at"])
+        state.completed_at = _from_timestamp(row["completed_at"])
+        state.progress = row["progress"]
+        state.error = row["error"]
+        if row["result_json"]:
+            state.result = TaskResult.model_validate_json(row["result_json"])
+        if state.status == TaskStatus.COMPLETED:
+            state.publish("completed", result=state.result.model_dump(mode="json"))
+        elif state.status == TaskStatus.FAILED:
+            state.publish("failed", error=state.error)
+        return state
+
+
+def _from_timestamp(ts: Optional[float]) -> Optional[datetime.datetime]:
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
 
 
 class TaskManager:
-    """Manages async generation tasks with concurrency control."""
+    """Manages async generation tasks with a bounded queue and worker pool.
+
+    When given a ``db_path``, task state is persisted to SQLite when a task
+    is submitted, when it starts and when it finishes, so finished tasks
+    survive restarts, queued and running ones come back as failed, and only
+    a bounded working set stays in memory.
+    """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, db_path: Optional[str | Path] = None):
         self._settings = settings
-        self._tasks: dict[str, TaskState] = {}
-        self._semaphore = asyncio.Semaphore(_MAX_CONCURRENT)
+        self._store: Optional[TaskStore] = TaskStore(db_path) if db_path else None
+        # Insertion/access ordered so the least recently used task is first
+        self._tasks: OrderedDict[str, TaskState] = OrderedDict()
+        self._queue: asyncio.Queue[TaskState] = asyncio.Queue(maxsize=_MAX_QUEUED)
+        self._background: list[asyncio.Task] = []
+        # Task IDs are a per-process random prefix plus a submission counter
+        self._id_prefix = secrets.token_hex(3)
+        self._id_counter = itertools.count()
+        # Idle pipelines keyed by _pool_key, reused so provider clients keep
+        # their connection pools warm across tasks.
+        self._pipeline_pool: dict[int, list[PaperBananaPipeline]] = {}
+        # One connection pool shared by every pipeline's HTTP-based providers
+        self._http_client = create_http_client(verify=not settings.skip_ssl_verification)
+
+    async def start(self) -> None:
+        """Open the task store and spawn the queue workers and expired-task sweeper."""
+        if self._store is not None:
+            interrupted = await self._store.open()
+            if interrupted:
+                logger.warning("Marked interrupted tasks as failed", count=interrupted)
+        self._background = [asyncio.create_task(self._worker()) for _ in range(_MAX_CONCURRENT)]
+        self._background.append(asyncio.create_task(self._sweep()))
 
     def submit(self, request: GenerateRequest) -> str:
-        """Create a new task and schedule it for background execution."""
-        task_id = uuid.uuid4().hex[:12]
+        """Create a new task and queue it for background execution.
+
+        Raises:
+            asyncio.QueueFull: If too many tasks are already waiting.
+        """
+        task_id = f"{self._id_prefix}{next(self._id_counter):06x}"
         state = TaskState(task_id=task_id, request=request)
+        self._queue.put_nowait(state)
+        if len(self._tasks) >= _MAX_TASKS:
+            self._evict_oldest_finished()
         self._tasks[task_id] = state
-        asyncio.create_task(self._execute(state))
+        self._persist_nowait(state)
         logger.info("Task submitted", task_id=task_id)
         return task_id
 
-    def get(self, task_id: str) -> Optional[TaskState]:
-        """Look up a task by ID."""
-        return self._tasks.get(task_id)
+    async def get(self, task_id: str) -> Optional[TaskState]:
+        """Look up a task by ID, falling back to the task store."""
+        state = self._tasks.get(task_id)
+        if state is not None:
+            self._tasks.move_to_end(task_id)
+            return state
 
-    async def _execute(self, state: TaskState) -> None:
-        """Run the pipeline for a single task under semaphore control."""
-        async with self._semaphore:
-            state.status = TaskStatus.RUNNING
-            state.progress = "Initializing pipeline"
-            logger.info("Task started", task_id=state.task_id)
+        if self._store is None:
+            return None
+        row = await self._store.load(task_id)
+        if row is None:
+            return None
+        state = TaskState.from_row(row)
+        if len(self._tasks) >= _MAX_TASKS:
+            self._evict_oldest_finished()
+        self._tasks[task_id] = state
+        return state
+
+    def _evict_oldest_finished(self) -> None:
+        """Forget the least recently used task that is no longer pending or running."""
+        for task_id, state in self._tasks.items():
+            if state.status in _FINISHED:
+                del self._tasks[task_id]
+                return
+
+    async def expire_finished(self, ttl: float = _TASK_TTL) -> int:
+        """Forget finished tasks that completed more than ``ttl`` seconds ago.
 
+        Returns:
+            Number of tasks removed.
+        """
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=ttl)
+        expired = [
+            task_id
+            for task_id, state in self._tasks.items()
+            if state.status in _FINISHED and state.completed_at < cutoff
+        ]
+        for task_id in expired:
+            del self._tasks[task_id]
+
+        if self._store is not None:
+            return await self._store.delete_finished_before(cutoff.timestamp())
+        return len(expired)
+
+    async def _persist(self, state: TaskState) -> None:
+        """Write a task's state to the store; failures are logged, not raised."""
+        if self._store is None:
+            return
+        try:
+            await self._store.save(state.to_row())
+        except Exception as exc:
+            logger.warning("Failed to persist task", task_id=state.task_id, error=str(exc))
+
+    def _persist_nowait(self, state: TaskState) -> None:
+        """Queue a write of a task's state from synchronous code.
+
+        Store writes run in submission order, so this row always lands before
+        the ones ``_execute`` writes later. Failures are logged, not raised.
+        """
+        if self._store is None:
+            return
+
+        def _log_failure(future: Future) -> None:
+            exc = future.exception()
+            if exc is not None:
+                logger.warning("Failed to persist task", task_id=state.task_id, error=str(exc))
+
+        self._store.save_nowait(state.to_row()).add_done_callback(_log_failure)
+
+    def _checkout_pipeline(self, settings: Settings) -> PaperBananaPipeline:
+        """Take an idle pipeline for these settings from the pool, or build one."""
+        idle = self._pipeline_pool.get(_pool_key(settings))
+        if idle:
+            pipeline = idle.pop()
+            pipeline.new_run()
+            return pipeline
+        return PaperBananaPipeline(settings=settings, http_client=self._http_client)
+
+    def _release_pipeline(self, pipeline: PaperBananaPipeline) -> None:
+        """Return a pipeline to the pool for reuse by later tasks."""
+        self._pipeline_pool.setdefault(_pool_key(pipeline.settings), []).append(pipeline)
+
+    async def close(self) -> None:
+        """Stop background tasks and release pooled pipelines and the shared HTTP client."""
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background = []
+        if self._store is not None:
+            await self._store.close()
+
+        pipelines = [p for idle in self._pipeline_pool.values() for p in idle]
+        self._pipeline_pool.clear()
+        results = await asyncio.gather(*(p.aclose() for p in pipelines), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Failed to close pipeline clients", error=str(result))
+        await self._http_client.aclose()
+
+    async def _worker(self) -> None:
+        """Pull queued tasks and run them one at a time."""
+        while True:
+            state = await self._queue.get()
             try:
-                # Build settings with optional iteration override
-                settings = self._settings
-                if state.request.refinement_iterations is not None:
-                    settings = settings.model_copy(
-                        update={"refinement_iterations": state.request.refinement_iterations}
-                    )
-
-                pipeline = PaperBananaPipeline(settings=settings)
-
-                diagram_type = DiagramType(state.request.diagram_type)
-                gen_input = GenerationInput(
-                    source_context=state.request.source_context,
-                    communicative_intent=state.request.communicative_intent,
-                    diagram_type=diagram_type,
-                    raw_data=state.request.raw_data,
-                )
+                await self._execute(state)
+            finally:
+                self._queue.task_done()
 
-                def on_progress(msg: str):
-                    state.progress = msg
+    async def _sweep(self) -> None:
+        """Periodically drop expired finished tasks."""
+        while True:
+            await asyncio.sleep(_SWEEP_INTERVAL)
+            removed = await self.expire_finished()
+            if removed:
+                logger.info("Expired finished tasks", count=removed, remaining=len(self._tasks))
 
-                state.progress = "Running generation pipeline"
-                output = await pipeline.generate(gen_input, progress_callback=on_progress)
+    async def _execute(self, state: TaskState) -> None:
+        """Run the pipeline for a single task."""
+        state.status = TaskStatus.RUNNING
+        state.set_progress("Initializing pipeline")
+        logger.info("Task started", task_id=state.task_id)
+        await self._persist(state)
 
-                state.result = TaskResult(
-                    image_url=f"/api/v1/tasks/{state.task_id}/image",
-                    run_id=pipeline.run_id,
-                    description=output.description,
-                    total_iterations=len(output.iterations),
-                    metadata=output.metadata,
-                )
-                state.status = TaskStatus.COMPLETED
-                state.completed_at = datetime.datetime.now(datetime.timezone.utc)
-                state.progress = None
-                logger.info(
-                    "Task completed",
-                    task_id=state.task_id,
-                    run_id=pipeline.run_id,
+        pipeline: Optional[PaperBananaPipeline] = None
+        try:
+            # Build settings with optional iteration override
+            settings = self._settings
+            if state.request.refinement_iterations is not None:
+                settings = settings.model_copy(
+                    update={"refinement_iterations": state.request.refinement_iterations}
                 )
 
-                _cleanup_genai_client(pipeline)
-
-            except Exception as exc:
-                state.status = TaskStatus.FAILED
-                state.error = str(exc)
-                state.completed_at = datetime.datetime.now(datetime.timezone.utc)
-                state.progress = None
-                logger.error(
-                    "Task failed",
-                    task_id=state.task_id,
-                    error=str(exc),
-                    exc_info=True,
-                )
+            pipeline = self._checkout_pipeline(settings)
+
+            diagram_type = DiagramType(state.request.diagram_type)
+            gen_input = GenerationInput(
+                source_context=state.request.source_context,
+                communicative_intent=state.request.communicative_intent,
+                diagram_type=diagram_type,
+                raw_data=state.request.raw_data,
+            )
+
+            state.set_progress("Running generation pipeline")
+            output = await pipeline.generate(gen_input, progress_callback=state.set_progress)
+
+            state.result = TaskResult.model_construct(
+                image_url=f"/api/v1/tasks/{state.task_id}/image",
+                run_id=pipeline.run_id,
+                description=output.description,
+                total_iterations=len(output.iterations),
+                metadata=output.metadata,
+            )
+            state.status = TaskStatus.COMPLETED
+            state.completed_at = datetime.datetime.now(datetime.timezone.utc)
+            state.progress = None
+            state.publish("completed", result=state.result.model_dump(mode="json"))
+            logger.info(
+                "Task completed",
+                task_id=state.task_id,
+                run_id=pipeline.run_id,
+            )
 
-                if "pipeline" in locals():
-                    _cleanup_genai_client(pipeline)
+        except Exception as exc:
+            state.status = TaskStatus.FAILED
+            state.error = str(exc)
+            state.completed_at = datetime.datetime.now(datetime.timezone.utc)
+            state.progress = None
+            state.publish("failed", error=state.error)
+            logger.error(
+                "Task failed",
+                task_id=state.task_id,
+                error=str(exc),
+                exc_info=True,
+            )
+        finally:
+            state.request = _trim_request(state.request)
+            if pipeline is not None:
+                self._release_pipeline(pipeline)
+            await self._persist(state)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
+from string import Formatter
 from typing import Any
 
 import structlog
@@ -13,6 +15,34 @@ from paperbanana.providers.base import VLMProvider
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=64)
+def _read_prompt(prompt_dir: str, diagram_type: str, agent_name: str) -> str:
+    """Read a prompt template from disk, cached for the life of the process."""
+    path = Path(prompt_dir) / diagram_type / f"{agent_name}.txt"
+    if not path.exists():
+        raise FileNotFoundError(f"Prompt template not found: {path}")
+    return path.read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=64)
+def _split_template(template: str) -> tuple[str, tuple[str, ...], str]:
+    """Split a template before its final placeholder.
+
+    Returns the head, the field names the head uses and the tail. Templates
+    put per-iteration values (the description) last, so the head renders the
+    same on every refinement round.
+    """
+    fields = [name for _, name, _, _ in Formatter().parse(template) if name]
+    if not fields or not all(name.isidentifier() for name in fields):
+        return "", (), template
+    cut = template.rfind("{" + fields[-1])
+    if cut <= 0 or template[cut - 1] == "{":
+        return "", (), template
+    head = template[:cut]
+    head_fields = tuple(dict.fromkeys(name for _, name, _, _ in Formatter().parse(head) if name))
+    return head, head_fields, template[cut:]
+
+
 class BaseAgent(ABC):
     """Base class for all agents in the PaperBanana pipeline.
 
@@ -23,6 +53,12 @@ class BaseAgent(ABC):
     def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
         self.vlm = vlm_provider
         self.prompt_dir = Path(prompt_dir)
+        # Resolved once so every agent sharing a prompt dir shares cache keys
+        self._prompt_root = str(self.prompt_dir.resolve())
+        self._prompts: dict[str, str] = {}
+        # Last rendered template head as (head, values, rendered). A single
+        # slot on the agent, so no source context outlives the agent's run
+        self._rendered_head: tuple[str, tuple, str] | None = None
 
     @property
     @abstractmethod
@@ -44,11 +80,28 @@ class BaseAgent(ABC):
         Returns:
             Prompt template string with {placeholders}.
         """
-        path = self.prompt_dir / diagram_type / f"{self.agent_name}.txt"
-        if not path.exists():
-            raise FileNotFoundError(f"Prompt template not found: {path}")
-        return path.read_text(encoding="utf-8")
+        template = self._prompts.get(diagram_type)
+        if template is None:
+            template = _read_prompt(self._prompt_root, diagram_type, self.agent_name)
+            self._prompts[diagram_type] = template
+        return template
 
     def format_prompt(self, template: str, **kwargs: Any) -> str:
-        """Format a prompt template with the given values."""
-        return template.format(**kwargs)
+        """Format a prompt template with the given values.
+
+        The part before the final placeholder is rendered once and reused
+        while its values stay the same, e.g. across refinement rounds.
+        """
+        head, fields, tail = _split_template(template)
+        values = tuple(kwargs[name] for name in fields)
+        cached = self._rendered_head
+        if cached is not None and cached[0] == head and cached[1] == values:
+            rendered = cached[2]
+        else:
+            rendered = head.format_map(kwargs)
+            self._rendered_head = (head, values, rendered)
+        return rendered + tail.format_map(kwargs)
+
+    def clear_prompt_cache(self) -> None:
+        """Drop the rendered prompt head kept from the current run."""
+        self._rendered_head = None
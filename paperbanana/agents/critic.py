@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import json
-
+import orjson
 import structlog
 
 from paperbanana.agents.base import BaseAgent
@@ -81,15 +80,25 @@ class CriticAgent(BaseAgent):
     def _parse_response(self, response: str) -> CritiqueResult:
         """Parse the VLM response into a CritiqueResult."""
         try:
-            data = json.loads(response)
-            return CritiqueResult(
-                critic_suggestions=data.get("critic_suggestions", []),
-                revised_description=data.get("revised_description"),
-            )
-        except (json.JSONDecodeError, KeyError) as e:
+            data = orjson.loads(response)
+            suggestions = data.get("critic_suggestions", [])
+            revised = data.get("revised_description")
+        except (orjson.JSONDecodeError, AttributeError) as e:
             logger.warning("Failed to parse critic response", error=str(e))
             # Conservative fallback: empty suggestions means no revision needed
             return CritiqueResult(
                 critic_suggestions=[],
                 revised_description=None,
             )
+
+        # Skip pydantic validation when the reply already has the expected shape
+        if (
+            isinstance(suggestions, list)
+            and all(isinstance(s, str) for s in suggestions)
+            and (revised is None or isinstance(revised, str))
+        ):
+            return CritiqueResult.model_construct(
+                critic_suggestions=suggestions,
+                revised_description=revised,
+            )
+        return CritiqueResult(critic_suggestions=suggestions, revised_description=revised)
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import asyncio
+import io
+import os
 
 import structlog
 
@@ -24,6 +26,8 @@ class PlannerAgent(BaseAgent):
 
     def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
         super().__init__(vlm_provider, prompt_dir)
+        # Directory -> (mtime_ns, file names), refreshed when the directory changes
+        self._dir_listings: dict[str, tuple[int, frozenset[str]]] = {}
 
     @property
     def agent_name(self) -> str:
@@ -47,20 +51,28 @@ class PlannerAgent(BaseAgent):
         Returns:
             Detailed textual description for the Visualizer.
         """
-        # Format examples for in-context learning
-        examples_text = self._format_examples(examples)
-
-        # Load reference images for visual in-context learning
-        example_images = self._load_example_images(examples)
-
-        prompt_type = "diagram" if diagram_type == DiagramType.METHODOLOGY else "plot"
-        template = self.load_prompt(prompt_type)
-        prompt = self.format_prompt(
-            template,
-            source_context=source_context,
-            caption=caption,
-            examples=examples_text,
-        )
+        # Decode reference images in the background while the prompt is built
+        images_task = asyncio.create_task(self._load_example_images(examples))
+
+        try:
+            # Format examples for in-context learning
+            examples_text = self._format_examples(examples)
+
+            prompt_type = "diagram" if diagram_type == DiagramType.METHODOLOGY else "plot"
+            template = self.load_prompt(prompt_type)
+            prompt = self.format_prompt(
+                template,
+                source_context=source_context,
+                caption=caption,
+                examples=examples_text,
+            )
+        except BaseException:
+            # Do not leave the image loads running unobserved
+            images_task.cancel()
+            await asyncio.gather(images_task, return_exceptions=True)
+            raise
+
+        example_images = await images_task
 
         logger.info(
             "Running planner agent",
@@ -88,45 +100,72 @@ class PlannerAgent(BaseAgent):
         if not examples:
             return "(No reference examples available. Generate based on source context alone.)"
 
-        lines = []
+        # Examples are labelled by their stable ID rather than their position,
+        # so the same example renders identically wherever it is selected.
+        buf = io.StringIO()
         img_index = 0
-        for i, ex in enumerate(examples, 1):
-            has_image = self._has_valid_image(ex)
-            image_ref = ""
-            if has_image:
+        for i, ex in enumerate(examples):
+            if i:
+                buf.write("\n")
+            buf.write("### Example ")
+            buf.write(ex.id)
+            buf.write("\n**Caption**: ")
+            buf.write(ex.caption)
+            buf.write("\n**Source Context**: ")
+            buf.write(ex.excerpt(500))
+            if self._has_valid_image(ex):
                 img_index += 1
-                image_ref = f"\n**Diagram**: [See reference image {img_index} above]"
-
-            lines.append(
-                f"### Example {i}\n"
-                f"**Caption**: {ex.caption}\n"
-                f"**Source Context**: {ex.source_context[:500]}"
-                f"{image_ref}\n"
-            )
-        return "\n".join(lines)
+                buf.write(f"\n**Diagram**: [See reference image {img_index} above]")
+            buf.write("\n")
+        return buf.getvalue()
 
     def _has_valid_image(self, example: ReferenceExample) -> bool:
-        """Check if a reference example has a valid image file."""
+        """Check if a reference example has a valid image file.
+
+        Reference images usually share a directory, so each directory is
+        listed once and re-listed only when its mtime changes, rather than
+        stat-ing every image on every call.
+        """
         if not example.image_path:
             return False
-        return Path(example.image_path).exists()
-
-    def _load_example_images(self, examples: list[ReferenceExample]) -> list:
+        parent, name = os.path.split(example.image_path)
+        return name in self._list_dir(parent or ".")
+
+    def _list_dir(self, directory: str) -> frozenset[str]:
+        """Names of the entries in ``directory``, cached by the directory's mtime."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return frozenset()
+        cached = self._dir_listings.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        with os.scandir(directory) as entries:
+            names = frozenset(entry.name for entry in entries)
+        self._dir_listings[directory] = (mtime_ns, names)
+        return names
+
+    async def _load_example_images(self, examples: list[ReferenceExample]) -> list:
         """Load reference images from disk for in-context learning.
 
-        Returns a list of PIL Image objects for examples that have valid images.
+        Images are decoded concurrently in worker threads so the event loop
+        stays free. Returns a list of PIL Image objects, in example order, for
+        examples that have valid images.
         """
+        paths = [ex.image_path for ex in examples if self._has_valid_image(ex)]
+        results = await asyncio.gather(
+            *(asyncio.to_thread(load_image, path) for path in paths),
+            return_exceptions=True,
+        )
+
         images = []
-        for ex in examples:
-            if not self._has_valid_image(ex):
-                continue
-            try:
-                img = load_image(ex.image_path)
-                images.append(img)
-            except Exception as e:
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
                 logger.warning(
                     "Failed to load reference image",
-                    image_path=ex.image_path,
-                    error=str(e),
+                    image_path=path,
+                    error=str(result),
                 )
+                continue
+            images.append(result)
         return images
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
-import json
+import io
+import math
+import re
+from collections import Counter
+from typing import Optional
 
+import orjson
 import structlog
 
 from paperbanana.agents.base import BaseAgent
@@ -12,6 +17,55 @@ from paperbanana.providers.base import VLMProvider
 
 logger = structlog.get_logger()
 
+# Candidate pools larger than this multiple of num_examples are shortlisted
+# lexically before the VLM re-ranks them. The shortlist depends on the query,
+# so the candidate block differs between requests and cannot serve as a
+# cacheable prompt prefix; the retriever templates therefore keep the target
+# input first and the candidates after it.
+_PREFILTER_FACTOR = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Recovers the ID list from replies that are not valid JSON as a whole
+_SELECTED_IDS_RE = re.compile(r'"(?:selected_ids|top_10_papers|top_10_plots)"\s*:\s*(\[[^\]]*\])')
+
+# Standard BM25 parameters
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _LexicalIndex:
+    """BM25 index over the caption and methodology text of reference examples."""
+
+    def __init__(self, candidates: list[ReferenceExample]):
+        self.candidates = candidates
+        self._docs = [Counter(_tokenize(f"{c.caption} {c.source_context}")) for c in candidates]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = (sum(self._lengths) / len(self._docs)) or 1.0
+        doc_freq = Counter(term for doc in self._docs for term in doc)
+        n = len(self._docs)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+
+    def top_k(self, query: str, k: int) -> list[ReferenceExample]:
+        """Return the ``k`` best-scoring candidates, best first (ties keep pool order)."""
+        terms = set(_tokenize(query)) & self._idf.keys()
+        scores = []
+        for doc, length in zip(self._docs, self._lengths):
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / self._avg_length)
+            score = 0.0
+            for term in terms & doc.keys():
+                tf = doc[term]
+                score += self._idf[term] * tf * (_BM25_K1 + 1) / (tf + norm)
+            scores.append(score)
+        ranked = sorted(range(len(scores)), key=lambda i: -scores[i])
+        return [self.candidates[i] for i in ranked[:k]]
+
 
 class RetrieverAgent(BaseAgent):
     """Retrieves the most relevant reference examples from the curated set.
@@ -22,6 +76,8 @@ class RetrieverAgent(BaseAgent):
 
     def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
         super().__init__(vlm_provider, prompt_dir)
+        # Lexical index of the last candidate pool, keyed by its example IDs
+        self._index: Optional[tuple[tuple[str, ...], _LexicalIndex]] = None
 
     @property
     def agent_name(self) -> str:
@@ -60,6 +116,11 @@ class RetrieverAgent(BaseAgent):
             )
             return candidates
 
+        # Shortlist large pools so the prompt grows with num_examples, not the pool
+        shortlist_size = _PREFILTER_FACTOR * num_examples
+        if len(candidates) > shortlist_size:
+            candidates = self._prefilter(f"{caption} {source_context}", candidates, shortlist_size)
+
         # Format candidates for the prompt
         candidates_text = self._format_candidates(candidates)
 
@@ -91,20 +152,37 @@ class RetrieverAgent(BaseAgent):
         logger.info("Retriever selected examples", count=len(selected))
         return selected[:num_examples]
 
+    def _prefilter(
+        self, query: str, candidates: list[ReferenceExample], k: int
+    ) -> list[ReferenceExample]:
+        """Shortlist the ``k`` candidates that best match ``query`` lexically (BM25).
+
+        The index is rebuilt only when the candidate pool changes.
+        """
+        key = tuple(c.id for c in candidates)
+        if self._index is None or self._index[0] != key:
+            self._index = (key, _LexicalIndex(candidates))
+        shortlist = self._index[1].top_k(query, k)
+        logger.debug("Retriever prefiltered candidates", pool=len(candidates), kept=len(shortlist))
+        return shortlist
+
     def _format_candidates(self, candidates: list[ReferenceExample]) -> str:
         """Format candidate examples for the prompt.
 
         Matches paper's format: Paper ID, Caption, Methodology section.
         """
-        lines = []
+        buf = io.StringIO()
         for i, c in enumerate(candidates):
-            lines.append(
-                f"Candidate Paper {i + 1}:\n"
-                f"- **Paper ID:** {c.id}\n"
-                f"- **Caption:** {c.caption}\n"
-                f"- **Methodology section:** {c.source_context[:300]}...\n"
-            )
-        return "\n".join(lines)
+            if i:
+                buf.write("\n")
+            buf.write(f"Candidate Paper {i + 1}:\n- **Paper ID:** ")
+            buf.write(c.id)
+            buf.write("\n- **Caption:** ")
+            buf.write(c.caption)
+            buf.write("\n- **Methodology section:** ")
+            buf.write(c.excerpt(300))
+            buf.write("...\n")
+        return buf.getvalue()
 
     def _parse_response(
         self, response: str, candidates: list[ReferenceExample]
@@ -112,20 +190,23 @@ class RetrieverAgent(BaseAgent):
         """Parse the VLM response to extract selected example IDs.
 
         Handles both 'selected_ids' (our format) and 'top_10_papers'/'top_10_plots'
-        (paper's format) JSON keys for robustness.
+        (paper's format) JSON keys for robustness. If the reply is not valid
+        JSON, the ID array is recovered from it directly when possible.
         """
         try:
-            data = json.loads(response)
+            data = orjson.loads(response)
             selected_ids = (
                 data.get("selected_ids")
                 or data.get("top_10_papers")
                 or data.get("top_10_plots")
                 or []
             )
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse retriever response as JSON, using fallback")
-            # Fallback: return first N candidates
-            return candidates
+        except (orjson.JSONDecodeError, AttributeError):
+            selected_ids = self._recover_ids(response)
+            if selected_ids is None:
+                logger.warning("Failed to parse retriever response as JSON, using fallback")
+                # Fallback: return first N candidates
+                return candidates
 
         # Map IDs back to ReferenceExample objects
         id_to_example = {c.id: c for c in candidates}
@@ -137,3 +218,16 @@ class RetrieverAgent(BaseAgent):
                 logger.warning("Retriever selected unknown ID", id=eid)
 
         return selected
+
+    def _recover_ids(self, response: str) -> Optional[list]:
+        """Extract the selected ID array from a reply that is not valid JSON."""
+        match = _SELECTED_IDS_RE.search(response)
+        if match is None:
+            return None
+        # Tolerate a trailing comma, the most common slip in model-written JSON
+        array = re.sub(r",\s*\]$", "]", match.group(1))
+        try:
+            ids = orjson.loads(array)
+        except orjson.JSONDecodeError:
+            return None
+        return ids if isinstance(ids, list) else None
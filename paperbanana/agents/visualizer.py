@@ -2,23 +2,159 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import re
 import subprocess
 import sys
-import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import structlog
 from PIL import Image
 
 from paperbanana.agents.base import BaseAgent
 from paperbanana.core.types import DiagramType
-from paperbanana.core.utils import save_image
+from paperbanana.core.utils import hash_content, save_image
 from paperbanana.providers.base import ImageGenProvider, VLMProvider
 
 logger = structlog.get_logger()
 
+_PLOT_TIMEOUT = 60.0
+
+# Raw data up to this many bytes of JSON is written into the plot prompt;
+# larger data is shown as a sample and read by the plot code from DATA_PATH
+_INLINE_DATA_BYTES = 4000
+_DATA_SAMPLE_ROWS = 5
+
+_INJECTED_PATH_RE = re.compile(r'^(?:OUTPUT|DATA)_PATH\s*=\s*["\'].*["\']\s*$', re.MULTILINE)
+# A ```python fence wins over any other fence in the same response
+_PYTHON_BLOCK_RE = re.compile(r"```python(.*?)```", re.DOTALL)
+_CODE_BLOCK_RE = re.compile(r"```(.*?)```", re.DOTALL)
+
+# Runs in the plot worker process: matplotlib (and the data libraries plot
+# code usually imports) is loaded once, then each stdin line is a JSON job
+# whose code is exec'd with OUTPUT_PATH and DATA_PATH preset.
+_PLOT_WORKER_BOOTSTRAP = r"""
+import json, os, sys, traceback
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+for name in ("numpy", "pandas", "seaborn"):
+    try:
+        __import__(name)
+    except ImportError:
+        pass
+
+# Replies go to a private copy of stdout; anything the plot code prints
+# is sent to stderr instead
+reply = os.fdopen(os.dup(1), "w")
+os.dup2(2, 1)
+sys.stdout = sys.stderr
+
+for line in sys.stdin:
+    job = json.loads(line)
+    try:
+        exec(
+            compile(job["code"], "<plot>", "exec"),
+            {
+                "__name__": "__main__",
+                "OUTPUT_PATH": job["output_path"],
+                "DATA_PATH": job["data_path"],
+            },
+        )
+        result = {"ok": True}
+    except SystemExit as exc:
+        result = {"ok": exc.code in (None, 0), "error": f"SystemExit({exc.code})"}
+    except BaseException:
+        result = {"ok": False, "error": traceback.format_exc()}
+    finally:
+        # Do not let one plot's figures or style leak into the next
+        plt.close("all")
+        matplotlib.rc_file_defaults()
+    reply.write(json.dumps(result) + "\n")
+    reply.flush()
+"""
+
+
+def _dump_json(data) -> bytes:
+    """Serialize plot data as compact JSON; values orjson cannot encode become strings."""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+class _PlotWorker:
+    """Long-lived Python process that executes plot code with matplotlib preloaded.
+
+    Saves the interpreter start-up and matplotlib import on every plot. A
+    worker that crashes or exceeds the timeout is killed and replaced on the
+    next job.
+    """
+
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                [sys.executable, "-c", _PLOT_WORKER_BOOTSTRAP],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        return self._proc
+
+    def start(self) -> None:
+        """Start the worker ahead of its first job, without waiting for a busy one."""
+        if self._lock.acquire(blocking=False):
+            try:
+                self._ensure_started()
+            finally:
+                self._lock.release()
+
+    def run(
+        self, code: str, output_path: str, data_path: Optional[str], timeout: float
+    ) -> tuple[bool, str]:
+        """Execute plot code and return ``(ok, error)``.
+
+        Raises:
+            subprocess.TimeoutExpired: If the code runs longer than ``timeout``.
+        """
+        with self._lock:
+            proc = self._ensure_started()
+            timer = threading.Timer(timeout, proc.kill)
+            start = time.monotonic()
+            timer.start()
+            try:
+                job = {"code": code, "output_path": output_path, "data_path": data_path}
+                proc.stdin.write(json.dumps(job) + "\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except OSError:
+                line = ""
+            finally:
+                timer.cancel()
+
+            if not line:
+                self.close()
+                if time.monotonic() - start >= timeout:
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+                return False, "Plot worker exited unexpectedly"
+            result = json.loads(line)
+            return result["ok"], result.get("error", "")
+
+    def close(self) -> None:
+        """Stop the worker process, if running."""
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
 
 class VisualizerAgent(BaseAgent):
     """Generates images from descriptions.
@@ -37,6 +173,7 @@ class VisualizerAgent(BaseAgent):
         super().__init__(vlm_provider, prompt_dir)
         self.image_gen = image_gen
         self.output_dir = Path(output_dir)
+        self._plot_worker: Optional[_PlotWorker] = None
 
     @property
     def agent_name(self) -> str:
@@ -92,7 +229,7 @@ class VisualizerAgent(BaseAgent):
         if output_path is None:
             output_path = str(self.output_dir / f"diagram_iter_{iteration}.png")
 
-        save_image(image, output_path)
+        await asyncio.to_thread(save_image, image, output_path)
         logger.info("Diagram saved", path=output_path)
         return output_path
 
@@ -104,16 +241,19 @@ class VisualizerAgent(BaseAgent):
         iteration: int,
     ) -> str:
         """Generate a statistical plot by generating and executing matplotlib code."""
-        # Build the description with raw data appended
-        full_description = description
+        data_text = ""
+        data_path = None
         if raw_data:
-            import json
-
-            full_description += f"\n\n## Raw Data\n```json\n{json.dumps(raw_data, indent=2)}\n```"
+            data_path = await asyncio.to_thread(self._write_plot_data, raw_data)
+            data_text = self._describe_plot_data(raw_data, data_path)
 
-        # Load and format the plot visualizer prompt template
+        # Raw data is fixed for the run and precedes the per-iteration
+        # description, so every refinement round shares the same prompt prefix
         template = self.load_prompt("plot")
-        code_prompt = self.format_prompt(template, description=full_description)
+        code_prompt = self.format_prompt(template, raw_data=data_text, description=description)
+
+        # Let a cold worker load its libraries while the plot code is generated
+        self._get_plot_worker().start()
 
         logger.info("Generating plot code", iteration=iteration)
 
@@ -129,59 +269,90 @@ class VisualizerAgent(BaseAgent):
         if output_path is None:
             output_path = str(self.output_dir / f"plot_iter_{iteration}.png")
 
-        # Execute the code
-        success = self._execute_plot_code(code, output_path)
+        # Execute the code off the event loop; it runs in a subprocess for up to 60s
+        success = await asyncio.to_thread(
+            self._execute_plot_code, code, output_path, str(data_path) if data_path else None
+        )
         if not success:
             logger.error("Plot code execution failed, using placeholder")
             # Create a placeholder image
             placeholder = Image.new("RGB", (1024, 768), color=(255, 255, 255))
-            save_image(placeholder, output_path)
+            await asyncio.to_thread(save_image, placeholder, output_path)
 
         return output_path
 
+    def _write_plot_data(self, raw_data: dict) -> Path:
+        """Write raw data to the output directory for plot code to load.
+
+        The file is named by a hash of its contents, so refinement rounds over
+        the same data share one file while new data never reuses a stale one.
+        """
+        payload = _dump_json(raw_data)
+        data_path = self.output_dir / f"plot_data_{hash_content(payload)}.json"
+        if not data_path.exists():
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            data_path.write_bytes(payload)
+        return data_path
+
+    def _describe_plot_data(self, raw_data: dict, data_path: Path) -> str:
+        """Render raw data for the plot prompt: inline if small, else a sample."""
+        if data_path.stat().st_size <= _INLINE_DATA_BYTES:
+            return f"\n\n## Raw Data\n```json\n{_dump_json(raw_data).decode()}\n```"
+
+        sample = {
+            key: value[:_DATA_SAMPLE_ROWS] if isinstance(value, list) else value
+            for key, value in raw_data.items()
+        }
+        sizes = ", ".join(
+            f"`{key}`: {len(value)} items"
+            for key, value in raw_data.items()
+            if isinstance(value, list)
+        )
+        return (
+            "\n\n## Raw Data (sample)\n"
+            f"The full data is too large to list here ({sizes or 'see file'}). "
+            "It is stored as JSON at the path in the predefined DATA_PATH variable; "
+            "load it with `json.load(open(DATA_PATH))` instead of typing values in. "
+            f"The first {_DATA_SAMPLE_ROWS} items of each list:\n"
+            f"```json\n{_dump_json(sample).decode()}\n```"
+        )
+
     def _extract_code(self, response: str) -> str:
         """Extract Python code from a VLM response."""
-        # Look for code blocks
-        if "```python" in response:
-            start = response.index("```python") + len("```python")
-            end = response.index("```", start)
-            return response[start:end].strip()
-        elif "```" in response:
-            start = response.index("```") + 3
-            end = response.index("```", start)
-            return response[start:end].strip()
-        return response.strip()
-
-    def _execute_plot_code(self, code: str, output_path: str) -> bool:
-        """Execute matplotlib code in a subprocess to generate a plot."""
-        # Strip any OUTPUT_PATH assignments from VLM-generated code so the
-        # injected value below is authoritative (the VLM is prompted to set
-        # OUTPUT_PATH itself, which would override the injected line).
-        code = re.sub(r'^OUTPUT_PATH\s*=\s*["\'].*["\']\s*$', "", code, flags=re.MULTILINE)
-
-        # Inject the output path
-        full_code = f'OUTPUT_PATH = "{output_path}"\n{code}'
+        match = _PYTHON_BLOCK_RE.search(response) or _CODE_BLOCK_RE.search(response)
+        return match.group(1).strip() if match else response.strip()
+
+    def _execute_plot_code(
+        self, code: str, output_path: str, data_path: Optional[str] = None
+    ) -> bool:
+        """Execute matplotlib code in the persistent plot worker to generate a plot."""
+        # Strip any OUTPUT_PATH/DATA_PATH assignments from VLM-generated code so
+        # the injected values are authoritative (the VLM is prompted to set
+        # OUTPUT_PATH itself, which would override the injected one).
+        code = _INJECTED_PATH_RE.sub("", code)
 
         # Ensure output directory exists
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(full_code)
-            temp_path = f.name
-
         try:
-            result = subprocess.run(
-                [sys.executable, temp_path],
-                capture_output=True,
-                text=True,
-                timeout=60,
+            ok, error = self._get_plot_worker().run(
+                code, output_path, data_path, timeout=_PLOT_TIMEOUT
             )
-            if result.returncode != 0:
-                logger.error("Plot code error", stderr=result.stderr[:500])
+            if not ok:
+                logger.error("Plot code error", stderr=error[-500:])
                 return False
             return Path(output_path).exists()
         except subprocess.TimeoutExpired:
             logger.error("Plot code timed out")
             return False
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+
+    def _get_plot_worker(self) -> _PlotWorker:
+        if self._plot_worker is None:
+            self._plot_worker = _PlotWorker()
+        return self._plot_worker
+
+    def close(self) -> None:
+        """Stop the plot worker process, if one was started."""
+        if self._plot_worker is not None:
+            self._plot_worker.close()
+            self._plot_worker = None
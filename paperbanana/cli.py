@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -50,7 +51,7 @@ def generate(
         console.print(f"[red]Error: Input file not found: {input}[/red]")
         raise typer.Exit(1)
 
-    source_context = input_path.read_text(encoding="utf-8")
+    source_context = _read_text(*_file_key(input_path))
 
     # Build settings — only override values explicitly passed via CLI
     overrides = {}
@@ -112,6 +113,51 @@ def generate(
     console.print(f"Total iterations: {len(result.iterations)}")
 
 
+def _file_key(path: Path) -> tuple[str, int, int]:
+    """Cache key for an input file: its path, modification time and size."""
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=64)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    """Read a UTF-8 text file; repeated reads of an unchanged file are memoized."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=16)
+def _load_plot_data(path: str, mtime_ns: int, size: int) -> tuple[dict, str]:
+    """Load a CSV or JSON data file as raw plot data plus a prompt summary.
+
+    CSV columns are kept as one list each rather than one dict per row, which
+    is much cheaper for large files and lets the visualizer sample each column.
+    The multi-threaded pyarrow parser is used when it is installed. Results are
+    memoized per file version and must not be mutated.
+    """
+    data_path = Path(path)
+    if data_path.suffix != ".csv":
+        import orjson
+
+        data = orjson.loads(data_path.read_bytes())
+        return {"data": data}, f"JSON data:\n{orjson.dumps(data).decode()[:2000]}"
+
+    import pandas as pd
+
+    try:
+        import pyarrow  # noqa: F401
+
+        df = pd.read_csv(data_path, engine="pyarrow")
+    except ImportError:
+        df = pd.read_csv(data_path)
+
+    raw_data = {str(column): df[column].tolist() for column in df.columns}
+    source_context = (
+        f"CSV data with columns: {list(df.columns)}\n"
+        f"Rows: {len(df)}\nSample:\n{df.head().to_string()}"
+    )
+    return raw_data, source_context
+
+
 @app.command()
 def plot(
     data: str = typer.Option(..., "--data", "-d", help="Path to data file (CSV or JSON)"),
@@ -126,22 +172,7 @@ def plot(
         console.print(f"[red]Error: Data file not found: {data}[/red]")
         raise typer.Exit(1)
 
-    # Load data
-    import json as json_mod
-
-    if data_path.suffix == ".csv":
-        import pandas as pd
-
-        df = pd.read_csv(data_path)
-        raw_data = df.to_dict(orient="records")
-        source_context = (
-            f"CSV data with columns: {list(df.columns)}\n"
-            f"Rows: {len(df)}\nSample:\n{df.head().to_string()}"
-        )
-    else:
-        with open(data_path) as f:
-            raw_data = json_mod.load(f)
-        source_context = f"JSON data:\n{json_mod.dumps(raw_data, indent=2)[:2000]}"
+    raw_data, source_context = _load_plot_data(*_file_key(data_path))
 
     from dotenv import load_dotenv
 
@@ -156,7 +187,7 @@ def plot(
         source_context=source_context,
         communicative_intent=intent,
         diagram_type=DiagramType.STATISTICAL_PLOT,
-        raw_data={"data": raw_data},
+        raw_data=raw_data,
     )
 
     console.print(
@@ -242,7 +273,7 @@ def evaluate(
         console.print(f"[red]Error: Reference image not found: {reference}[/red]")
         raise typer.Exit(1)
 
-    context_text = Path(context).read_text(encoding="utf-8")
+    context_text = _read_text(*_file_key(Path(context)))
 
     from dotenv import load_dotenv
 
@@ -2,29 +2,41 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 import yaml
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+# libyaml-backed loader when PyYAML was built with it; same semantics as safe_load
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-class VLMConfig(BaseSettings):
+# The section classes below describe the nested YAML layout. Only Settings
+# reads the environment, so they are plain dataclasses rather than
+# BaseSettings subclasses.
+
+
+@dataclass(slots=True)
+class VLMConfig:
     """VLM provider configuration."""
 
     provider: str = "apicore"
     model: str = "gemini-2.5-flash"
+    image_format: str = "png"
 
 
-class ImageConfig(BaseSettings):
+@dataclass(slots=True)
+class ImageConfig:
     """Image generation provider configuration."""
 
     provider: str = "nanobanana"
     model: str = "google/nano-banana"
 
 
-class PipelineConfig(BaseSettings):
+@dataclass(slots=True)
+class PipelineConfig:
     """Pipeline execution configuration."""
 
     num_retrieval_examples: int = 10
@@ -33,14 +45,16 @@ class PipelineConfig(BaseSettings):
     diagram_type: str = "methodology"
 
 
-class ReferenceConfig(BaseSettings):
+@dataclass(slots=True)
+class ReferenceConfig:
     """Reference set configuration."""
 
     path: str = "data/reference_sets"
     guidelines_path: str = "data/guidelines"
 
 
-class OutputConfig(BaseSettings):
+@dataclass(slots=True)
+class OutputConfig:
     """Output configuration."""
 
     dir: str = "outputs"
@@ -55,6 +69,9 @@ class Settings(BaseSettings):
     # Provider settings
     vlm_provider: str = "apicore"
     vlm_model: str = "gemini-2.5-flash"
+    # Encoding for images sent to the VLM; JPEG uploads are much smaller for
+    # photographic inputs, PNG keeps line art and text lossless
+    vlm_image_format: Literal["png", "jpeg"] = "png"
     image_provider: str = "nanobanana"
     image_model: str = "google/nano-banana"
 
@@ -91,7 +108,7 @@ class Settings(BaseSettings):
         config_path = Path(config_path)
         if config_path.exists():
             with open(config_path) as f:
-                yaml_config = yaml.safe_load(f) or {}
+                yaml_config = yaml.load(f, Loader=_YamlLoader) or {}
         else:
             yaml_config = {}
 
@@ -100,32 +117,34 @@ class Settings(BaseSettings):
         return cls(**flat)
 
 
-def _flatten_yaml(config: dict, prefix: str = "") -> dict:
-    """Flatten nested YAML config into flat settings keys."""
+# Nested YAML key path -> flat Settings field
+_YAML_KEY_MAP: tuple[tuple[tuple[str, ...], str], ...] = (
+    (("vlm", "provider"), "vlm_provider"),
+    (("vlm", "model"), "vlm_model"),
+    (("vlm", "base_url"), "vlm_base_url"),
+    (("vlm", "image_format"), "vlm_image_format"),
+    (("image", "provider"), "image_provider"),
+    (("image", "model"), "image_model"),
+    (("pipeline", "num_retrieval_examples"), "num_retrieval_examples"),
+    (("pipeline", "refinement_iterations"), "refinement_iterations"),
+    (("pipeline", "output_resolution"), "output_resolution"),
+    (("reference", "path"), "reference_set_path"),
+    (("reference", "guidelines_path"), "guidelines_path"),
+    (("output", "dir"), "output_dir"),
+    (("output", "save_iterations"), "save_iterations"),
+)
+
+
+def _flatten_yaml(config: dict) -> dict:
+    """Flatten nested YAML config into flat settings keys.
+
+    Only the known key paths are looked up; everything else is ignored.
+    """
     flat = {}
-    key_map = {
-        "vlm.provider": "vlm_provider",
-        "vlm.model": "vlm_model",
-        "image.provider": "image_provider",
-        "image.model": "image_model",
-        "pipeline.num_retrieval_examples": "num_retrieval_examples",
-        "pipeline.refinement_iterations": "refinement_iterations",
-        "pipeline.output_resolution": "output_resolution",
-        "reference.path": "reference_set_path",
-        "reference.guidelines_path": "guidelines_path",
-        "output.dir": "output_dir",
-        "output.save_iterations": "save_iterations",
-        "vlm.base_url": "vlm_base_url",
-    }
-
-    def _recurse(d: dict, prefix: str = "") -> None:
-        for k, v in d.items():
-            full_key = f"{prefix}.{k}" if prefix else k
-            if isinstance(v, dict):
-                _recurse(v, full_key)
-            else:
-                if full_key in key_map:
-                    flat[key_map[full_key]] = v
-
-    _recurse(config)
+    for path, flat_key in _YAML_KEY_MAP:
+        value: Any = config
+        for part in path:
+            value = value.get(part) if isinstance(value, dict) else None
+        if value is not None and not isinstance(value, dict):
+            flat[flat_key] = value
     return flat
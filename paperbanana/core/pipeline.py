@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import datetime
+import os
+import shutil
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import structlog
 
@@ -27,10 +32,59 @@ from paperbanana.guidelines.plots import load_plot_guidelines
 from paperbanana.providers.registry import ProviderRegistry
 from paperbanana.reference.store import ReferenceStore
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = structlog.get_logger()
 
 _ssl_skip_applied = False
 
+# Settings never written to run metadata
+_SENSITIVE_FIELDS = frozenset(
+    {"google_api_key", "openrouter_api_key", "apicore_api_key", "kie_api_key"}
+)
+
+
+async def _settle_preconnect(task: asyncio.Task) -> None:
+    """Stop a connection warm-up if still running; its failures never fail the run."""
+    task.cancel()
+    (result,) = await asyncio.gather(task, return_exceptions=True)
+    if isinstance(result, Exception):
+        logger.debug("Image provider preconnect failed", error=str(result))
+
+
+@lru_cache(maxsize=1)
+def _default_settings() -> Settings:
+    """Settings from env/defaults, built once and shared by pipelines created without any."""
+    return Settings()
+
+
+def _load_guidelines(guidelines_path: str) -> tuple[str, str]:
+    """Methodology and plot guidelines for a directory.
+
+    Not memoized here: the loaders cache file contents per modification
+    time, so an edited guidelines file is picked up by the next run.
+    """
+    return load_methodology_guidelines(guidelines_path), load_plot_guidelines(guidelines_path)
+
+
+@lru_cache(maxsize=4)
+def _resolve_prompt_dir(cwd: str) -> str:
+    """Locate the prompts directory once per working directory.
+
+    ``cwd`` is only the cache key: the first candidate is relative to it.
+    """
+    # Check common locations
+    candidates = [
+        Path("prompts"),
+        Path(__file__).parent.parent.parent / "prompts",
+    ]
+    for p in candidates:
+        if p.exists():
+            return str(p)
+    # Default
+    return "prompts"
+
 
 def _apply_ssl_skip():
     """Disable SSL verification globally for corporate proxy environments."""
@@ -43,29 +97,11 @@ def _apply_ssl_skip():
 
     logger.warning("SSL verification disabled via SKIP_SSL_VERIFICATION=true")
 
-    # Handle stdlib ssl (urllib, http.client)
+    # Handle stdlib ssl (urllib, http.client). httpx clients are not patched:
+    # the pipeline's shared client and the genai clients are created with
+    # verification off instead.
     ssl._create_default_https_context = ssl._create_unverified_context
 
-    # Handle httpx
-    try:
-        import httpx
-
-        _orig_client_init = httpx.Client.__init__
-        _orig_async_init = httpx.AsyncClient.__init__
-
-        def _patched_client_init(self, *args, **kwargs):
-            kwargs["verify"] = False
-            _orig_client_init(self, *args, **kwargs)
-
-        def _patched_async_init(self, *args, **kwargs):
-            kwargs["verify"] = False
-            _orig_async_init(self, *args, **kwargs)
-
-        httpx.Client.__init__ = _patched_client_init
-        httpx.AsyncClient.__init__ = _patched_async_init
-    except ImportError:
-        pass
-
     # Suppress urllib3 InsecureRequestWarning
     try:
         import urllib3
@@ -75,6 +111,27 @@ def _apply_ssl_skip():
         pass
 
 
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link ``src`` to ``dst``, falling back to a plain content copy.
+
+    Iteration images are never modified after they are written, so sharing
+    the file is safe and avoids rewriting the image.
+    """
+    # Replace, never write through, a file left by an earlier run in this directory
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _save_all(artifacts: list[tuple[dict, Path]]) -> None:
+    """Write buffered JSON artifacts in order, stopping at the first failure."""
+    for data, path in artifacts:
+        save_json(data, path)
+
+
 class PaperBananaPipeline:
     """Main orchestration pipeline for academic illustration generation.
 
@@ -88,6 +145,7 @@ class PaperBananaPipeline:
         settings: Optional[Settings] = None,
         vlm_client=None,
         image_gen_fn=None,
+        http_client=None,
     ):
         """Initialize the pipeline.
 
@@ -95,71 +153,153 @@ class PaperBananaPipeline:
             settings: Configuration settings. If None, loads from env/defaults.
             vlm_client: Optional pre-configured VLM client (for HF Spaces demo).
             image_gen_fn: Optional image generation function (for HF Spaces demo).
+            http_client: Optional ``httpx.AsyncClient`` shared by HTTP-based
+                providers; the caller keeps ownership and closes it.
         """
-        self.settings = settings or Settings()
+        self.settings = settings or _default_settings()
         self.run_id = generate_run_id()
+        self._run_dir_path: Optional[Path] = None
 
         if self.settings.skip_ssl_verification:
             _apply_ssl_skip()
 
-        # Initialize providers
-        if vlm_client is not None:
+        # Providers, the reference store, guidelines and agents are built on
+        # first use, so callers that never generate do not pay for them
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self._demo_mode = vlm_client is not None
+        if self._demo_mode:
             # Demo mode: use provided clients
             self._vlm = vlm_client
             self._image_gen = image_gen_fn
-            self._demo_mode = True
+            vlm_name = getattr(vlm_client, "name", "custom")
+            image_gen_name = getattr(image_gen_fn, "name", "custom")
         else:
-            self._vlm = ProviderRegistry.create_vlm(self.settings)
-            self._image_gen = ProviderRegistry.create_image_gen(self.settings)
-            self._demo_mode = False
+            vlm_name = self.settings.vlm_provider
+            image_gen_name = self.settings.image_provider
+
+        logger.info(
+            "Pipeline initialized",
+            run_id=self.run_id,
+            vlm=vlm_name,
+            image_gen=image_gen_name,
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """The client shared by HTTP-based providers, created here if none was passed."""
+        if self._http_client is None:
+            from paperbanana.providers.http import create_http_client
+
+            self._http_client = create_http_client(verify=not self.settings.skip_ssl_verification)
+        return self._http_client
 
-        # Load reference store
-        self.reference_store = ReferenceStore(self.settings.reference_set_path)
+    @cached_property
+    def _vlm(self):
+        return ProviderRegistry.create_vlm(self.settings, http_client=self._get_http_client())
 
-        # Load guidelines
+    @cached_property
+    def _image_gen(self):
+        return ProviderRegistry.create_image_gen(self.settings, http_client=self._get_http_client())
+
+    @cached_property
+    def reference_store(self) -> ReferenceStore:
+        return ReferenceStore(self.settings.reference_set_path)
+
+    @cached_property
+    def _guidelines_dir(self) -> str:
         guidelines_path = self.settings.guidelines_path
-        self._methodology_guidelines = load_methodology_guidelines(guidelines_path)
-        self._plot_guidelines = load_plot_guidelines(guidelines_path)
-
-        # Initialize agents
-        prompt_dir = self._find_prompt_dir()
-        self.retriever = RetrieverAgent(self._vlm, prompt_dir=prompt_dir)
-        self.planner = PlannerAgent(self._vlm, prompt_dir=prompt_dir)
-        self.stylist = StylistAgent(
-            self._vlm, guidelines=self._methodology_guidelines, prompt_dir=prompt_dir
+        if guidelines_path:
+            guidelines_path = str(Path(guidelines_path).resolve())
+        return guidelines_path
+
+    @property
+    def _guidelines(self) -> tuple[str, str]:
+        """Methodology and plot guidelines, in that order, as currently on disk."""
+        return _load_guidelines(self._guidelines_dir)
+
+    @property
+    def _methodology_guidelines(self) -> str:
+        return self._guidelines[0]
+
+    @property
+    def _plot_guidelines(self) -> str:
+        return self._guidelines[1]
+
+    @cached_property
+    def _prompt_dir(self) -> str:
+        return self._find_prompt_dir()
+
+    @cached_property
+    def retriever(self) -> RetrieverAgent:
+        return RetrieverAgent(self._vlm, prompt_dir=self._prompt_dir)
+
+    @cached_property
+    def planner(self) -> PlannerAgent:
+        return PlannerAgent(self._vlm, prompt_dir=self._prompt_dir)
+
+    @cached_property
+    def stylist(self) -> StylistAgent:
+        return StylistAgent(
+            self._vlm, guidelines=self._methodology_guidelines, prompt_dir=self._prompt_dir
         )
-        self.visualizer = VisualizerAgent(
+
+    @cached_property
+    def visualizer(self) -> VisualizerAgent:
+        return VisualizerAgent(
             self._image_gen,
             self._vlm,
-            prompt_dir=prompt_dir,
+            prompt_dir=self._prompt_dir,
             output_dir=str(self._run_dir),
         )
-        self.critic = CriticAgent(self._vlm, prompt_dir=prompt_dir)
 
-        logger.info(
-            "Pipeline initialized",
-            run_id=self.run_id,
-            vlm=getattr(self._vlm, "name", "custom"),
-            image_gen=getattr(self._image_gen, "name", "custom"),
-        )
+    @cached_property
+    def critic(self) -> CriticAgent:
+        return CriticAgent(self._vlm, prompt_dir=self._prompt_dir)
 
     @property
     def _run_dir(self) -> Path:
-        """Directory for this run's outputs."""
-        return ensure_dir(Path(self.settings.output_dir) / self.run_id)
+        """Directory for this run's outputs, created on first access."""
+        if self._run_dir_path is None:
+            self._run_dir_path = ensure_dir(Path(self.settings.output_dir) / self.run_id)
+        return self._run_dir_path
+
+    def new_run(self) -> str:
+        """Start a fresh run, reusing this pipeline's providers and agents.
+
+        Lets long-lived callers (e.g. the HTTP API) keep provider clients warm
+        across jobs while still writing each job to its own run directory.
+
+        Returns:
+            The new run ID.
+        """
+        self.run_id = generate_run_id()
+        self._run_dir_path = None
+        if "visualizer" in self.__dict__:
+            self.visualizer.output_dir = self._run_dir
+        for name in ("retriever", "planner", "stylist", "visualizer", "critic"):
+            agent = self.__dict__.get(name)
+            if agent is not None:
+                agent.clear_prompt_cache()
+        return self.run_id
+
+    async def aclose(self) -> None:
+        """Close the network clients of this pipeline's providers and its plot worker.
+
+        Only what has actually been created is closed.
+        """
+        if "visualizer" in self.__dict__:
+            self.visualizer.close()
+        for name in ("_vlm", "_image_gen"):
+            aclose = getattr(self.__dict__.get(name), "aclose", None)
+            if aclose is not None:
+                await aclose()
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     def _find_prompt_dir(self) -> str:
         """Find the prompts directory relative to the package."""
-        # Check common locations
-        candidates = [
-            Path("prompts"),
-            Path(__file__).parent.parent.parent / "prompts",
-        ]
-        for p in candidates:
-            if p.exists():
-                return str(p)
-        # Default
-        return "prompts"
+        return _resolve_prompt_dir(os.getcwd())
 
     async def generate(
         self,
@@ -194,147 +334,174 @@ class PaperBananaPipeline:
             context_length=len(input.source_context),
         )
 
-        # Select guidelines based on diagram type
-        guidelines = (
-            self._methodology_guidelines
-            if input.diagram_type == DiagramType.METHODOLOGY
-            else self._plot_guidelines
-        )
-
-        # ── Phase 1: Linear Planning ─────────────────────────────────
-
-        # Step 1: Retriever — find relevant examples
-        logger.info("Phase 1: Retrieval")
-        _progress("Retriever: selecting reference examples...")
-        candidates = self.reference_store.get_all()
-        examples = await self.retriever.run(
-            source_context=input.source_context,
-            caption=input.communicative_intent,
-            candidates=candidates,
-            num_examples=self.settings.num_retrieval_examples,
-            diagram_type=input.diagram_type,
-        )
-
-        # Step 2: Planner — generate textual description
-        logger.info("Phase 1: Planning")
-        _progress("Planner: generating diagram description...")
-        description = await self.planner.run(
-            source_context=input.source_context,
-            caption=input.communicative_intent,
-            examples=examples,
-            diagram_type=input.diagram_type,
-        )
-
-        # Step 3: Stylist — optimize description aesthetics
-        logger.info("Phase 1: Styling")
-        _progress("Stylist: applying style guidelines...")
-        optimized_description = await self.stylist.run(
-            description=description,
-            guidelines=guidelines,
-            source_context=input.source_context,
-            caption=input.communicative_intent,
-            diagram_type=input.diagram_type,
-        )
-
-        # Save planning outputs
-        if self.settings.save_iterations:
-            save_json(
-                {
-                    "retrieved_examples": [e.id for e in examples],
-                    "initial_description": description,
-                    "optimized_description": optimized_description,
-                },
-                self._run_dir / "planning.json",
+        # Diagrams are rendered by the image provider only after planning, so
+        # its connection is opened meanwhile
+        preconnect = None
+        if input.diagram_type == DiagramType.METHODOLOGY:
+            preconnect = getattr(self._image_gen, "preconnect", None)
+        preconnect_task = asyncio.create_task(preconnect()) if preconnect else None
+
+        # JSON artifacts are buffered and written together in one worker thread
+        artifacts: list[tuple[dict, Path]] = []
+
+        try:
+            # Select guidelines based on diagram type
+            guidelines = (
+                self._methodology_guidelines
+                if input.diagram_type == DiagramType.METHODOLOGY
+                else self._plot_guidelines
             )
 
-        # ── Phase 2: Iterative Refinement ─────────────────────────────
-
-        current_description = optimized_description
-        iterations: list[IterationRecord] = []
-
-        for i in range(self.settings.refinement_iterations):
-            logger.info(f"Phase 2: Iteration {i + 1}/{self.settings.refinement_iterations}")
+            # ── Phase 1: Linear Planning ─────────────────────────────────
 
-            # Step 4: Visualizer — generate image
-            _progress(f"Visualizer: rendering image (round {i + 1}/{total_iters})...")
-            image_path = await self.visualizer.run(
-                description=current_description,
+            # Step 1: Retriever — find relevant examples
+            logger.info("Phase 1: Retrieval")
+            _progress("Retriever: selecting reference examples...")
+            candidates = self.reference_store.get_all()
+            examples = await self.retriever.run(
+                source_context=input.source_context,
+                caption=input.communicative_intent,
+                candidates=candidates,
+                num_examples=self.settings.num_retrieval_examples,
                 diagram_type=input.diagram_type,
-                raw_data=input.raw_data,
-                iteration=i + 1,
             )
 
-            # Step 5: Critic — evaluate and provide feedback
-            _progress(f"Critic: evaluating result (round {i + 1}/{total_iters})...")
-            critique = await self.critic.run(
-                image_path=image_path,
-                description=current_description,
+            # Step 2: Planner — generate textual description
+            logger.info("Phase 1: Planning")
+            _progress("Planner: generating diagram description...")
+            description = await self.planner.run(
                 source_context=input.source_context,
                 caption=input.communicative_intent,
+                examples=examples,
                 diagram_type=input.diagram_type,
             )
 
-            iteration_record = IterationRecord(
-                iteration=i + 1,
-                description=current_description,
-                image_path=image_path,
-                critique=critique,
+            # Step 3: Stylist — optimize description aesthetics
+            logger.info("Phase 1: Styling")
+            _progress("Stylist: applying style guidelines...")
+            optimized_description = await self.stylist.run(
+                description=description,
+                guidelines=guidelines,
+                source_context=input.source_context,
+                caption=input.communicative_intent,
+                diagram_type=input.diagram_type,
             )
-            iterations.append(iteration_record)
 
-            # Save iteration artifacts
+            # Save planning outputs
             if self.settings.save_iterations:
-                iter_dir = ensure_dir(self._run_dir / f"iter_{i + 1}")
-                save_json(
-                    {
-                        "description": current_description,
-                        "critique": critique.model_dump(),
-                    },
-                    iter_dir / "details.json",
+                artifacts.append(
+                    (
+                        {
+                            "retrieved_examples": [e.id for e in examples],
+                            "initial_description": description,
+                            "optimized_description": optimized_description,
+                        },
+                        self._run_dir / "planning.json",
+                    )
                 )
 
-            # Check if revision needed
-            if critique.needs_revision and critique.revised_description:
-                logger.info(
-                    "Revision needed",
-                    iteration=i + 1,
-                    summary=critique.summary,
-                )
-                current_description = critique.revised_description
-            else:
-                logger.info(
-                    "No further revision needed",
-                    iteration=i + 1,
-                    summary=critique.summary,
-                )
-                # Adjust total_steps since we're finishing early
-                total_steps = current_step + 1
-                break
+            # ── Phase 2: Iterative Refinement ─────────────────────────────
 
-        # Final output
-        _progress("Finalizing output...")
-        final_image = iterations[-1].image_path
-        final_output_path = str(self._run_dir / "final_output.png")
+            current_description = optimized_description
+            iterations: list[IterationRecord] = []
 
-        # Copy final image to output location
-        import shutil
+            for i in range(self.settings.refinement_iterations):
+                logger.info(f"Phase 2: Iteration {i + 1}/{self.settings.refinement_iterations}")
 
-        shutil.copy2(final_image, final_output_path)
+                # Step 4: Visualizer — generate image
+                _progress(f"Visualizer: rendering image (round {i + 1}/{total_iters})...")
+                image_path = await self.visualizer.run(
+                    description=current_description,
+                    diagram_type=input.diagram_type,
+                    raw_data=input.raw_data,
+                    iteration=i + 1,
+                )
 
-        # Build metadata
-        metadata = RunMetadata(
-            run_id=self.run_id,
-            timestamp=datetime.datetime.now().isoformat(),
-            vlm_provider=getattr(self._vlm, "name", "custom"),
-            vlm_model=getattr(self._vlm, "model_name", "custom"),
-            image_provider=getattr(self._image_gen, "name", "custom"),
-            image_model=getattr(self._image_gen, "model_name", "custom"),
-            refinement_iterations=len(iterations),
-            config_snapshot=self.settings.model_dump(exclude={"google_api_key"}),
-        )
+                # Step 5: Critic — evaluate and provide feedback
+                _progress(f"Critic: evaluating result (round {i + 1}/{total_iters})...")
+                critique = await self.critic.run(
+                    image_path=image_path,
+                    description=current_description,
+                    source_context=input.source_context,
+                    caption=input.communicative_intent,
+                    diagram_type=input.diagram_type,
+                )
 
-        if self.settings.save_iterations:
-            save_json(metadata.model_dump(), self._run_dir / "metadata.json")
+                iteration_record = IterationRecord(
+                    iteration=i + 1,
+                    description=current_description,
+                    image_path=image_path,
+                    critique=critique,
+                )
+                iterations.append(iteration_record)
+
+                # Save iteration artifacts
+                if self.settings.save_iterations:
+                    # save_json creates the directory in the worker thread
+                    artifacts.append(
+                        (
+                            {
+                                "description": current_description,
+                                "critique": critique.model_dump(),
+                            },
+                            self._run_dir / f"iter_{i + 1}" / "details.json",
+                        )
+                    )
+
+                # Check if revision needed
+                if critique.needs_revision and critique.revised_description:
+                    logger.info(
+                        "Revision needed",
+                        iteration=i + 1,
+                        summary=critique.summary,
+                    )
+                    current_description = critique.revised_description
+                else:
+                    logger.info(
+                        "No further revision needed",
+                        iteration=i + 1,
+                        summary=critique.summary,
+                    )
+                    # Adjust total_steps since we're finishing early
+                    total_steps = current_step + 1
+                    break
+
+            # Final output
+            _progress("Finalizing output...")
+            final_image = iterations[-1].image_path
+            final_output_path = str(self._run_dir / "final_output.png")
+
+            # Link (or, across filesystems, copy) the final image to the output location
+            await asyncio.to_thread(_link_or_copy, final_image, final_output_path)
+
+            # Build metadata
+            metadata = RunMetadata(
+                run_id=self.run_id,
+                timestamp=datetime.datetime.now().isoformat(),
+                vlm_provider=getattr(self._vlm, "name", "custom"),
+                vlm_model=getattr(self._vlm, "model_name", "custom"),
+                image_provider=getattr(self._image_gen, "name", "custom"),
+                image_model=getattr(self._image_gen, "model_name", "custom"),
+                refinement_iterations=len(iterations),
+                # Defaults are kept so the run stays reproducible if they change
+                config_snapshot=self.settings.model_dump(exclude=_SENSITIVE_FIELDS),
+            )
+
+            if self.settings.save_iterations:
+                artifacts.append((metadata.model_dump(), self._run_dir / "metadata.json"))
+        except BaseException:
+            # A failed run still leaves what it produced for inspection, and a
+            # failed write must not hide the stage's error
+            try:
+                await asyncio.to_thread(_save_all, artifacts)
+            except Exception as e:
+                logger.warning("Could not save artifacts of failed run", error=str(e))
+            raise
+        finally:
+            if preconnect_task is not None:
+                await _settle_preconnect(preconnect_task)
+
+        await asyncio.to_thread(_save_all, artifacts)
 
         output = GenerationOutput(
             image_path=final_output_path,
@@ -5,7 +5,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 
 class DiagramType(str, Enum):
@@ -29,12 +29,28 @@ class GenerationInput(BaseModel):
 class ReferenceExample(BaseModel):
     """A single reference example from the curated set."""
 
+    # Immutable, so cached excerpts can never go stale
+    model_config = ConfigDict(frozen=True)
+
     id: str
     source_context: str
     caption: str
     image_path: str
     category: Optional[str] = None
 
+    _excerpts: dict[int, str] = PrivateAttr(default_factory=dict)
+
+    def excerpt(self, length: int) -> str:
+        """Return the first ``length`` characters of ``source_context``.
+
+        Excerpts are cached per length, so prompts built repeatedly from the
+        same reference set do not re-slice long source texts.
+        """
+        text = self._excerpts.get(length)
+        if text is None:
+            text = self._excerpts[length] = self.source_context[:length]
+        return text
+
 
 class CritiqueResult(BaseModel):
     """Output from the Critic agent."""
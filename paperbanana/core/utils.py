@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import base64
-import datetime
 import hashlib
 import json
-import uuid
+import os
+import time
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Optional
 
+import orjson
 import structlog
 from PIL import Image
 
@@ -19,9 +21,13 @@ logger = structlog.get_logger()
 
 def generate_run_id() -> str:
     """Generate a unique run ID based on timestamp."""
-    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    short_uuid = uuid.uuid4().hex[:6]
-    return f"run_{ts}_{short_uuid}"
+    # Integer formatting avoids strftime's format parsing; the 6-hex-digit
+    # suffix needs only 3 random bytes rather than a full UUID
+    t = time.localtime()
+    return (
+        f"run_{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}"
+        f"_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}_{os.urandom(3).hex()}"
+    )
 
 
 def ensure_dir(path: Path) -> Path:
@@ -30,21 +36,77 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+_JPEG_QUALITY = 85
+
+
+def _encode_image(image: Image.Image, format: str) -> BytesIO:
+    # PNGs get fast, light compression: they are uploaded once, so encode
+    # time matters more than a slightly larger payload
+    buffer = BytesIO()
+    format = format.upper()
+    if format == "PNG":
+        image.save(buffer, format=format, compress_level=1)
+    elif format == "JPEG":
+        # JPEG has no alpha or palette modes
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buffer, format=format, quality=_JPEG_QUALITY)
+    else:
+        image.save(buffer, format=format)
+    return buffer
+
+
+def image_to_bytes(image: Image.Image, format: str = "PNG") -> bytes:
+    """Encode a PIL Image to bytes in the given format."""
+    return _encode_image(image, format).getvalue()
+
+
 def image_to_base64(image: Image.Image, format: str = "PNG") -> str:
     """Convert a PIL Image to a base64-encoded string."""
-    buffer = BytesIO()
-    image.save(buffer, format=format)
-    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+    # Encode straight from the buffer's memory instead of copying it out first
+    return base64.b64encode(_encode_image(image, format).getbuffer()).decode("ascii")
+
+
+def bytes_to_image(data: bytes, formats: Optional[tuple[str, ...]] = None) -> Image.Image:
+    """Convert encoded image file bytes (PNG, JPEG, ...) to a PIL Image.
 
+    The image is decoded immediately, so the encoded data can be released
+    as soon as this returns.
 
-def base64_to_image(b64_string: str) -> Image.Image:
-    """Convert a base64-encoded string to a PIL Image."""
-    data = base64.b64decode(b64_string)
-    return Image.open(BytesIO(data))
+    Args:
+        data: Encoded image file contents.
+        formats: PIL format names to try, in order, when the source is known
+            to produce only these; by default every registered format is tried.
+    """
+    image = Image.open(BytesIO(data), formats=formats)
+    image.load()
+    return image
+
+
+def base64_to_image(b64_data: str | bytes) -> Image.Image:
+    """Convert base64-encoded data (text or ASCII bytes) to a PIL Image."""
+    return bytes_to_image(base64.b64decode(b64_data))
 
 
 def load_image(path: str | Path) -> Image.Image:
-    """Load an image from a file path."""
+    """Load an image from a file path.
+
+    Decoded images are cached by path, mtime and size, so the result is
+    shared between callers and must not be modified in place.
+    """
+    st = os.stat(path)
+    return _decode_image(str(path), st.st_mtime_ns, st.st_size)
+
+
+# Large enough for a planner call's reference images (num_retrieval_examples,
+# 10 by default) plus the images under critique, while bounding memory use.
+# Runs that retrieve many more references per call can raise it through
+# PAPERBANANA_IMAGE_CACHE_SIZE, at roughly width * height * 3 bytes per entry.
+_IMAGE_CACHE_SIZE = int(os.environ.get("PAPERBANANA_IMAGE_CACHE_SIZE", "32"))
+
+
+@lru_cache(maxsize=_IMAGE_CACHE_SIZE)
+def _decode_image(path: str, mtime_ns: int, size: int) -> Image.Image:
     return Image.open(path).convert("RGB")
 
 
@@ -62,10 +124,16 @@ def load_text(path: str | Path) -> str:
 
 
 def save_json(data: Any, path: str | Path) -> None:
-    """Save data as JSON to a file."""
+    """Save data as indented JSON to a file.
+
+    orjson serializes straight to UTF-8 bytes, so no intermediate str is
+    built and re-encoded. Values it cannot encode are written as strings.
+    """
     path = Path(path)
     ensure_dir(path.parent)
-    path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+    path.write_bytes(
+        orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
 
 
 def load_json(path: str | Path) -> Any:
@@ -75,11 +143,31 @@ def load_json(path: str | Path) -> Any:
 
 def truncate_text(text: str, max_chars: int = 2000) -> str:
     """Truncate text to a maximum number of characters."""
-    if len(text) <= max_chars:
-        return text
-    return text[: max_chars - 3] + "..."
-
-
-def hash_content(content: str) -> str:
-    """Generate a short hash of content for deduplication."""
-    return hashlib.sha256(content.encode()).hexdigest()[:12]
+    return text if len(text) <= max_chars else f"{text[: max_chars - 3]}..."
+
+
+def truncate_text_join(parts: Iterable[str], max_chars: int = 2000) -> str:
+    """Join text parts and truncate the result like :func:`truncate_text`.
+
+    Parts are consumed only until the limit is passed, so long inputs are
+    never concatenated in full just to be cut down.
+    """
+    taken: list[str] = []
+    total = 0
+    for part in parts:
+        taken.append(part)
+        total += len(part)
+        if total > max_chars:
+            return f"{''.join(taken)[: max_chars - 3]}..."
+    return "".join(taken)
+
+
+def hash_content(content: str | bytes) -> str:
+    """Generate a short (12 hex character) hash of content for deduplication.
+
+    Not for security use: BLAKE2b with a 6-byte digest is fast and short by
+    construction. Bytes are hashed as-is; text is hashed as UTF-8.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.blake2b(content, digest_size=6).hexdigest()
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from itertools import product
 from pathlib import Path
 from typing import Optional
 
@@ -26,6 +28,59 @@ PRIMARY_DIMENSIONS = ["faithfulness", "readability"]
 SECONDARY_DIMENSIONS = ["conciseness", "aesthetics"]
 
 
+def _winner_to_side(winner: str) -> str:
+    """Map winner string to side: 'Model', 'Human', or 'Tie'."""
+    if winner == "Model":
+        return "Model"
+    if winner == "Human":
+        return "Human"
+    # "Both are good" and "Both are bad" are both ties
+    return "Tie"
+
+
+def _aggregate_pair(w1: str, w2: str) -> Optional[str]:
+    """Aggregate two dimension winners into a decisive result.
+
+    Returns a decisive winner if one exists, or None if tied.
+
+    Decisive: wins both, or wins one with a tie.
+    Tied: each wins one, or both tie.
+    """
+    s1 = _winner_to_side(w1)
+    s2 = _winner_to_side(w2)
+
+    # Both decisive for the same side
+    if s1 == s2 and s1 in ("Model", "Human"):
+        return s1
+
+    # One decisive, one tie
+    if s1 in ("Model", "Human") and s2 == "Tie":
+        return s1
+    if s2 in ("Model", "Human") and s1 == "Tie":
+        return s2
+
+    # Tied: both tie, or split (one Model, one Human)
+    return None
+
+
+def _aggregate(primary_1: str, primary_2: str, secondary_1: str, secondary_2: str) -> str:
+    """Overall winner from the primary pair, falling back to the secondary pair."""
+    return (
+        _aggregate_pair(primary_1, primary_2)
+        or _aggregate_pair(secondary_1, secondary_2)
+        # Complete tie
+        or "Both are good"
+    )
+
+
+# Every combination of valid winners is aggregated once at import; a lookup
+# in _hierarchical_aggregate replaces the per-evaluation comparisons
+_AGGREGATION_ORDER = (*PRIMARY_DIMENSIONS, *SECONDARY_DIMENSIONS)
+_AGGREGATION_TABLE: dict[tuple[str, ...], str] = {
+    key: _aggregate(*key) for key in product(sorted(VALID_WINNERS), repeat=4)
+}
+
+
 class VLMJudge:
     """Evaluates generated illustrations using a VLM as judge.
 
@@ -39,6 +94,8 @@ class VLMJudge:
     def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
         self.vlm = vlm_provider
         self.prompt_dir = Path(prompt_dir)
+        # Raw templates per dimension, read from disk on first use
+        self._templates: dict[str, str] = {}
 
     async def evaluate(
         self,
@@ -58,28 +115,34 @@ class VLMJudge:
         Returns:
             EvaluationScore with comparative results and hierarchical overall.
         """
-        model_image = load_image(image_path)
-        reference_image = load_image(reference_path)
+        # load_image memoizes decodes by path, mtime and size, so a reference
+        # shared across a batch is decoded once
+        model_image, reference_image = await asyncio.gather(
+            asyncio.to_thread(load_image, image_path),
+            asyncio.to_thread(load_image, reference_path),
+        )
 
         # Both images: [Human reference, Model generated]
         images = [reference_image, model_image]
 
-        results: dict[str, DimensionResult] = {}
-
-        for dim in DIMENSIONS:
-            logger.info("Evaluating dimension", dimension=dim)
-
-            prompt = self._load_eval_prompt(dim, source_context, caption)
-
-            response = await self.vlm.generate(
-                prompt=prompt,
-                images=images,
-                temperature=0.1,
-                max_tokens=1024,
-                response_format="json",
+        # The dimensions are judged independently, so their calls run concurrently
+        logger.info("Evaluating dimensions", dimensions=DIMENSIONS)
+        responses = await asyncio.gather(
+            *(
+                self.vlm.generate(
+                    prompt=self._load_eval_prompt(dim, source_context, caption),
+                    images=images,
+                    temperature=0.1,
+                    max_tokens=1024,
+                    response_format="json",
+                )
+                for dim in DIMENSIONS
             )
+        )
 
-            results[dim] = self._parse_result(response, dim)
+        results: dict[str, DimensionResult] = {
+            dim: self._parse_result(response, dim) for dim, response in zip(DIMENSIONS, responses)
+        }
 
         # Hierarchical aggregation
         overall_winner = self._hierarchical_aggregate(results)
@@ -96,11 +159,14 @@ class VLMJudge:
 
     def _load_eval_prompt(self, dimension: str, source_context: str, caption: str) -> str:
         """Load evaluation prompt for a specific dimension."""
-        prompt_path = self.prompt_dir / "evaluation" / f"{dimension}.txt"
-        if not prompt_path.exists():
-            raise FileNotFoundError(f"Evaluation prompt not found: {prompt_path}")
+        template = self._templates.get(dimension)
+        if template is None:
+            prompt_path = self.prompt_dir / "evaluation" / f"{dimension}.txt"
+            if not prompt_path.exists():
+                raise FileNotFoundError(f"Evaluation prompt not found: {prompt_path}")
+            template = prompt_path.read_text(encoding="utf-8")
+            self._templates[dimension] = template
 
-        template = prompt_path.read_text(encoding="utf-8")
         return template.format(source_context=source_context, caption=caption)
 
     def _parse_result(self, response: str, dimension: str) -> DimensionResult:
@@ -141,55 +207,6 @@ class VLMJudge:
         the overall result. Otherwise, secondary dimensions (Conciseness +
         Aesthetics) break the tie using the same logic.
         """
-        primary_winner = self._aggregate_pair(
-            results[PRIMARY_DIMENSIONS[0]].winner,
-            results[PRIMARY_DIMENSIONS[1]].winner,
-        )
-
-        if primary_winner is not None:
-            return primary_winner
-
-        # Primary dimensions tied — fall back to secondary
-        secondary_winner = self._aggregate_pair(
-            results[SECONDARY_DIMENSIONS[0]].winner,
-            results[SECONDARY_DIMENSIONS[1]].winner,
-        )
-
-        if secondary_winner is not None:
-            return secondary_winner
-
-        # Complete tie
-        return "Both are good"
-
-    def _aggregate_pair(self, w1: str, w2: str) -> Optional[str]:
-        """Aggregate two dimension winners into a decisive result.
-
-        Returns a decisive winner if one exists, or None if tied.
-
-        Decisive: wins both, or wins one with a tie.
-        Tied: each wins one, or both tie.
-        """
-        s1 = self._winner_to_side(w1)
-        s2 = self._winner_to_side(w2)
-
-        # Both decisive for the same side
-        if s1 == s2 and s1 in ("Model", "Human"):
-            return s1
-
-        # One decisive, one tie
-        if s1 in ("Model", "Human") and s2 == "Tie":
-            return s1
-        if s2 in ("Model", "Human") and s1 == "Tie":
-            return s2
-
-        # Tied: both tie, or split (one Model, one Human)
-        return None
-
-    def _winner_to_side(self, winner: str) -> str:
-        """Map winner string to side: 'Model', 'Human', or 'Tie'."""
-        if winner == "Model":
-            return "Model"
-        if winner == "Human":
-            return "Human"
-        # "Both are good" and "Both are bad" are both ties
-        return "Tie"
+        key = tuple(results[dim].winner for dim in _AGGREGATION_ORDER)
+        overall = _AGGREGATION_TABLE.get(key)
+        return overall if overall is not None else _aggregate(*key)
@@ -2,29 +2,46 @@
 
 from __future__ import annotations
 
+from operator import attrgetter
+
 from paperbanana.core.types import EvaluationScore
 
 DIMENSIONS = ["faithfulness", "conciseness", "readability", "aesthetics"]
 
+# Per dimension: attribute getter, display label and flat dict keys, built once
+_DIMENSION_FIELDS = tuple(
+    (
+        attrgetter(dim),
+        dim.capitalize(),
+        f"{dim}_winner",
+        f"{dim}_score",
+        f"{dim}_reasoning",
+    )
+    for dim in DIMENSIONS
+)
+
 
 def format_scores(scores: EvaluationScore) -> str:
     """Format comparative evaluation scores as a readable string."""
-    lines = []
-    for dim in DIMENSIONS:
-        result = getattr(scores, dim)
-        lines.append(f"{dim.capitalize():14s} {result.winner:16s} ({result.score:.0f})")
-    lines.append(f"{'Overall':14s} {scores.overall_winner:16s} ({scores.overall_score:.0f})")
-    return "\n".join(lines)
+    return "\n".join(
+        (
+            *(
+                f"{label:14s} {(result := get(scores)).winner:16s} ({result.score:.0f})"
+                for get, label, *_ in _DIMENSION_FIELDS
+            ),
+            f"{'Overall':14s} {scores.overall_winner:16s} ({scores.overall_score:.0f})",
+        )
+    )
 
 
 def scores_to_dict(scores: EvaluationScore) -> dict:
     """Convert evaluation scores to a flat dictionary."""
     result = {}
-    for dim in DIMENSIONS:
-        dim_result = getattr(scores, dim)
-        result[f"{dim}_winner"] = dim_result.winner
-        result[f"{dim}_score"] = dim_result.score
-        result[f"{dim}_reasoning"] = dim_result.reasoning
+    for get, _, winner_key, score_key, reasoning_key in _DIMENSION_FIELDS:
+        dim_result = get(scores)
+        result[winner_key] = dim_result.winner
+        result[score_key] = dim_result.score
+        result[reasoning_key] = dim_result.reasoning
     result["overall_winner"] = scores.overall_winner
     result["overall_score"] = scores.overall_score
     return result
@@ -0,0 +1,25 @@
+"""Memoized reads of custom guideline files."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+def read_guidelines_file(path: Path) -> Optional[str]:
+    """Return the text of a guidelines file, or None if it does not exist.
+
+    The contents are cached per modification time, so an unchanged file is
+    only stat'ed while an edited one is read again.
+    """
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _read_guidelines(str(path), mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _read_guidelines(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
@@ -6,6 +6,8 @@ from pathlib import Path
 
 import structlog
 
+from paperbanana.guidelines._cache import read_guidelines_file
+
 logger = structlog.get_logger()
 
 DEFAULT_PLOT_GUIDELINES = """\
@@ -105,8 +107,9 @@ def load_plot_guidelines(guidelines_path: str | None = None) -> str:
     """
     if guidelines_path:
         path = Path(guidelines_path) / "plot_style_guide.md"
-        if path.exists():
+        text = read_guidelines_file(path)
+        if text is not None:
             logger.info("Loading custom plot guidelines", path=str(path))
-            return path.read_text(encoding="utf-8")
+            return text
 
     return DEFAULT_PLOT_GUIDELINES
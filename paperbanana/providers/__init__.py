@@ -1,6 +1,15 @@
 """Provider interfaces and implementations for PaperBanana."""
 
 from paperbanana.providers.base import ImageGenProvider, VLMProvider
-from paperbanana.providers.registry import ProviderRegistry
 
 __all__ = ["VLMProvider", "ImageGenProvider", "ProviderRegistry"]
+
+
+def __getattr__(name: str):
+    # The registry pulls in the settings model; importing the base classes
+    # (as every agent module does) should not
+    if name == "ProviderRegistry":
+        from paperbanana.providers.registry import ProviderRegistry
+
+        return ProviderRegistry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,48 @@
+"""google-genai client that closes cleanly during garbage collection.
+
+``BaseApiClient.aclose`` reads ``_async_httpx_client``, which some SDK
+versions only set on certain code paths, so a client collected after a
+partial init raises ``AttributeError`` from a finalizer. The subclasses
+here always define the attribute and swallow that error.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from google import genai
+from google.genai._api_client import BaseApiClient
+
+_DEBUG_CLIENT_MODES = ("record", "replay", "auto")
+
+
+class SafeBaseApiClient(BaseApiClient):
+    """``BaseApiClient`` whose ``aclose`` never fails on a missing async client."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._async_httpx_client = None
+        super().__init__(*args, **kwargs)
+
+    async def aclose(self) -> None:
+        try:
+            await super().aclose()
+        except AttributeError:
+            pass
+
+
+class SafeClient(genai.Client):
+    """``genai.Client`` backed by :class:`SafeBaseApiClient`."""
+
+    @staticmethod
+    def _get_api_client(debug_config: Any = None, **kwargs: Any) -> BaseApiClient:
+        if debug_config is not None and debug_config.client_mode in _DEBUG_CLIENT_MODES:
+            return genai.Client._get_api_client(debug_config=debug_config, **kwargs)
+        return SafeBaseApiClient(**kwargs)
+
+
+def create_genai_client(api_key: Optional[str], verify: bool = True) -> SafeClient:
+    """Create a :class:`SafeClient`, with TLS verification off if ``verify`` is False."""
+    http_options = None
+    if not verify:
+        http_options = {"client_args": {"verify": False}, "async_client_args": {"verify": False}}
+    return SafeClient(api_key=api_key, http_options=http_options)
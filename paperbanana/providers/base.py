@@ -56,6 +56,9 @@ class VLMProvider(ABC):
         """Check if this provider is configured and available."""
         return True
 
+    async def aclose(self) -> None:
+        """Release network clients held by this provider."""
+
 
 class ImageGenProvider(ABC):
     """Abstract interface for image generation providers.
@@ -102,3 +105,13 @@ class ImageGenProvider(ABC):
     def is_available(self) -> bool:
         """Check if this provider is configured and available."""
         return True
+
+    async def preconnect(self) -> None:
+        """Open a connection to the provider ahead of the first request.
+
+        Called in the background while the pipeline plans, so the connection
+        setup is not paid by the first image request. Must not raise.
+        """
+
+    async def aclose(self) -> None:
+        """Release network clients held by this provider."""
@@ -0,0 +1,33 @@
+"""Shared HTTP client for providers that call REST APIs through httpx."""
+
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+
+# Idle connections are kept for a minute rather than httpx's default 5 s, so
+# they survive the gaps between pipeline stages (e.g. the planning calls
+# before the first image request, or a critic call between two renders)
+_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+
+def create_http_client(verify: bool = True) -> httpx.AsyncClient:
+    """Create a pooled async client that several providers can share.
+
+    Providers send absolute URLs with their own auth headers and timeouts,
+    so a single client serves every provider host. HTTP/2 is enabled when
+    the optional ``h2`` package is installed (``pip install 'paperbanana[http2]'``),
+    letting concurrent requests to one host share a connection.
+
+    Args:
+        verify: Whether to verify TLS certificates.
+
+    Returns:
+        A new ``httpx.AsyncClient``; the caller owns it and must close it.
+    """
+    return httpx.AsyncClient(
+        limits=_LIMITS,
+        http2=importlib.util.find_spec("h2") is not None,
+        verify=verify,
+    )
@@ -0,0 +1,47 @@
+"""In-memory LRU of generated images for seeded requests."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+from PIL import Image
+
+_Key = tuple[str, Optional[str], int, int, int]
+
+
+class GenerationCache:
+    """Least-recently-used cache of images keyed by the full generation request.
+
+    Only requests with a seed are cached: without one, repeating a prompt is
+    a request for a new sample. Images are copied on the way in and out, so
+    callers may modify what they get back.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self._maxsize = maxsize
+        self._images: OrderedDict[_Key, Image.Image] = OrderedDict()
+
+    @staticmethod
+    def key(
+        prompt: str, negative_prompt: Optional[str], width: int, height: int, seed: Optional[int]
+    ) -> Optional[_Key]:
+        """Cache key for a request, or None if it must not be cached."""
+        if seed is None:
+            return None
+        return prompt, negative_prompt, width, height, seed
+
+    def get(self, key: Optional[_Key]) -> Optional[Image.Image]:
+        image = self._images.get(key) if key is not None else None
+        if image is None:
+            return None
+        self._images.move_to_end(key)
+        return image.copy()
+
+    def put(self, key: Optional[_Key], image: Image.Image) -> None:
+        if key is None or self._maxsize <= 0:
+            return
+        self._images[key] = image.copy()
+        self._images.move_to_end(key)
+        while len(self._images) > self._maxsize:
+            self._images.popitem(last=False)
@@ -0,0 +1,17 @@
+"""Aspect-ratio bands shared by the Gemini-based image providers."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+
+# Width/height ratios separating the five bands: tall portrait, portrait,
+# square, landscape and wide landscape. Portrait bands are closed below and
+# landscape bands closed above, so e.g. 1200x1000 (exactly 1.2) is square.
+_PORTRAIT_RATIOS = (0.67, 0.83)
+_LANDSCAPE_RATIOS = (1.2, 1.5)
+
+
+def aspect_band(width: int, height: int) -> int:
+    """Return the aspect band for a size, from 0 (tall portrait) to 4 (wide landscape)."""
+    ratio = width / height
+    return bisect_right(_PORTRAIT_RATIOS, ratio) + bisect_left(_LANDSCAPE_RATIOS, ratio)
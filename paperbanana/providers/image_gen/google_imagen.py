@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
-import base64
-from io import BytesIO
+from bisect import bisect_left
 from typing import Optional
 
 import structlog
 from PIL import Image
 from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log
 
+from paperbanana.core.utils import base64_to_image, bytes_to_image
 from paperbanana.providers.base import ImageGenProvider
+from paperbanana.providers.image_gen._sizing import aspect_band
 
 logger = structlog.get_logger()
 _std_logger = __import__("logging").getLogger(__name__)
 
+# Indexed by aspect_band
+_ASPECT_RATIOS = ("9:16", "2:3", "1:1", "3:2", "16:9")
+# Largest dimension (inclusive) for each size tier; anything larger is 4K
+_IMAGE_SIZE_LIMITS = (1024, 2048)
+_IMAGE_SIZES = ("1K", "2K", "4K")
+
 
 class GoogleImagenGen(ImageGenProvider):
     """Google Gemini 3 Pro Image generation via google-genai SDK.
@@ -27,9 +34,12 @@ class GoogleImagenGen(ImageGenProvider):
         self,
         api_key: Optional[str] = None,
         model: str = "gemini-3-pro-image-preview",
+        verify: bool = True,
     ):
         self._api_key = api_key
+        self._available = api_key is not None
         self._model = model
+        self._verify = verify
         self._client = None
 
     @property
@@ -43,9 +53,9 @@ class GoogleImagenGen(ImageGenProvider):
     def _get_client(self):
         if self._client is None:
             try:
-                from google import genai
+                from paperbanana.providers._patched_client import create_genai_client
 
-                self._client = genai.Client(api_key=self._api_key)
+                self._client = create_genai_client(self._api_key, verify=self._verify)
             except ImportError:
                 raise ImportError(
                     "google-genai is required for Google Imagen provider. "
@@ -54,27 +64,19 @@ class GoogleImagenGen(ImageGenProvider):
         return self._client
 
     def is_available(self) -> bool:
-        return self._api_key is not None
-
-    def _aspect_ratio(self, width: int, height: int) -> str:
-        ratio = width / height
-        if ratio > 1.5:
-            return "16:9"
-        if ratio > 1.2:
-            return "3:2"
-        if ratio < 0.67:
-            return "9:16"
-        if ratio < 0.83:
-            return "2:3"
-        return "1:1"
-
-    def _image_size(self, width: int, height: int) -> str:
-        max_dim = max(width, height)
-        if max_dim <= 1024:
-            return "1K"
-        if max_dim <= 2048:
-            return "2K"
-        return "4K"
+        return self._available
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _image_dims(self, width: int, height: int) -> tuple[str, str]:
+        """Return the Gemini ``(aspect_ratio, image_size)`` for a pixel size."""
+        return (
+            _ASPECT_RATIOS[aspect_band(width, height)],
+            _IMAGE_SIZES[bisect_left(_IMAGE_SIZE_LIMITS, max(width, height))],
+        )
 
     @retry(
         stop=stop_after_attempt(3),
@@ -96,12 +98,10 @@ class GoogleImagenGen(ImageGenProvider):
         if negative_prompt:
             prompt = f"{prompt}\n\nAvoid: {negative_prompt}"
 
+        aspect_ratio, image_size = self._image_dims(width, height)
         config = types.GenerateContentConfig(
             response_modalities=["IMAGE"],
-            image_config=types.ImageConfig(
-                aspect_ratio=self._aspect_ratio(width, height),
-                image_size=self._image_size(width, height),
-            ),
+            image_config=types.ImageConfig(aspect_ratio=aspect_ratio, image_size=image_size),
         )
 
         response = self._client.models.generate_content(
@@ -119,17 +119,14 @@ class GoogleImagenGen(ImageGenProvider):
         if not parts:
             raise ValueError("Gemini image response had no content parts.")
 
+        # Part.as_image returns the SDK's own Image type, or None for a text
+        # part, so the inline bytes are decoded to a PIL image here instead
         for part in parts:
-            if hasattr(part, "as_image"):
-                try:
-                    return part.as_image()
-                except Exception:
-                    pass
-            inline = getattr(part, "inline_data", None)
-            if inline and getattr(inline, "data", None):
-                data = inline.data
-                image_bytes = base64.b64decode(data) if isinstance(data, str) else data
-                return Image.open(BytesIO(image_bytes))
+            inline = part.inline_data
+            if inline is not None and inline.data:
+                if isinstance(inline.data, str):
+                    return base64_to_image(inline.data)
+                return bytes_to_image(inline.data)
 
         logger.error("No image data in Gemini response", model=self._model)
         raise ValueError("Gemini image response did not contain image data.")
@@ -3,23 +3,43 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from io import BytesIO
+import random
+import time
+from bisect import bisect_left
 from typing import Optional
 
+import httpx
+import orjson
 import structlog
 from PIL import Image
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from paperbanana.core.utils import bytes_to_image
 from paperbanana.providers.base import ImageGenProvider
+from paperbanana.providers.http import create_http_client
 
 logger = structlog.get_logger()
 
+_BASE_URL = "https://api.kie.ai/api/v1"
+_TIMEOUT = 60.0
+
 # Polling configuration
 _INITIAL_DELAY = 2.0  # seconds before first poll
-_POLL_INTERVAL = 3.0  # seconds between polls
+# Poll intervals grow from _POLL_MIN by _POLL_BACKOFF per attempt up to
+# _POLL_MAX, plus up to _POLL_JITTER so concurrent tasks do not poll in step
+_POLL_MIN = 1.0
+_POLL_MAX = 8.0
+_POLL_BACKOFF = 1.5
+_POLL_JITTER = 0.25
 _POLL_TIMEOUT = 300.0  # 5 minutes max
 
+# Width/height ratios separating the supported image_size values
+_IMAGE_SIZE_RATIOS = (0.5, 0.67, 0.77, 0.87, 1.15, 1.3, 1.5, 2.0)
+_IMAGE_SIZES = ("9:16", "2:3", "3:4", "4:5", "1:1", "5:4", "3:2", "16:9", "21:9")
+
+# Tasks request PNG output; JPEG is accepted in case a result is served as such
+_RESULT_FORMATS = ("PNG", "JPEG")
+
 
 class NanoBananaImageGen(ImageGenProvider):
     """Image generation via kie.ai Nano Banana async task API.
@@ -31,10 +51,18 @@ class NanoBananaImageGen(ImageGenProvider):
         self,
         api_key: Optional[str] = None,
         model: str = "google/nano-banana",
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         self._api_key = api_key
+        self._available = api_key is not None
         self._model = model
-        self._client = None
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        # A client passed in is shared with other providers and not closed here
+        self._client = http_client
+        self._owns_client = http_client is None
 
     @property
     def name(self) -> str:
@@ -44,42 +72,36 @@ class NanoBananaImageGen(ImageGenProvider):
     def model_name(self) -> str:
         return self._model
 
-    def _get_client(self):
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared httpx client, or lazily create a private pooled one.
+
+        The pipeline and the API task manager pass one client to every
+        provider they create, so instances share connections; the private
+        client only serves a provider constructed on its own. Every request
+        sets its own timeout.
+        """
         if self._client is None:
-            import httpx
-
-            self._client = httpx.AsyncClient(
-                base_url="https://api.kie.ai/api/v1",
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "Content-Type": "application/json",
-                },
-                timeout=60.0,
-            )
+            self._client = create_http_client()
         return self._client
 
     def is_available(self) -> bool:
-        return self._api_key is not None
+        return self._available
+
+    async def preconnect(self) -> None:
+        try:
+            await self._get_client().head(_BASE_URL, timeout=_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.debug("Preconnect failed", provider=self.name, error=str(e))
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
 
     def _image_size(self, width: int, height: int) -> str:
-        ratio = width / height
-        if ratio > 2.0:
-            return "21:9"
-        if ratio > 1.5:
-            return "16:9"
-        if ratio > 1.3:
-            return "3:2"
-        if ratio > 1.15:
-            return "5:4"
-        if ratio > 0.87:
-            return "1:1"
-        if ratio > 0.77:
-            return "4:5"
-        if ratio > 0.67:
-            return "3:4"
-        if ratio > 0.5:
-            return "2:3"
-        return "9:16"
+        # bisect_left counts the thresholds strictly below the ratio, so a
+        # ratio equal to a threshold stays in the narrower size
+        return _IMAGE_SIZES[bisect_left(_IMAGE_SIZE_RATIOS, width / height)]
 
     async def _create_task(self, prompt: str, width: int, height: int) -> str:
         """Submit an image generation task and return the task ID."""
@@ -92,9 +114,14 @@ class NanoBananaImageGen(ImageGenProvider):
                 "image_size": self._image_size(width, height),
             },
         }
-        response = await client.post("/jobs/createTask", json=payload)
+        response = await client.post(
+            f"{_BASE_URL}/jobs/createTask",
+            json=payload,
+            headers=self._headers,
+            timeout=_TIMEOUT,
+        )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         task_id = data.get("data", {}).get("taskId")
         if not task_id:
@@ -106,13 +133,19 @@ class NanoBananaImageGen(ImageGenProvider):
     async def _poll_task(self, task_id: str) -> list[str]:
         """Poll until the task completes and return result URLs."""
         client = self._get_client()
+        start = time.monotonic()
         await asyncio.sleep(_INITIAL_DELAY)
 
-        elapsed = _INITIAL_DELAY
-        while elapsed < _POLL_TIMEOUT:
-            response = await client.get("/jobs/recordInfo", params={"taskId": task_id})
+        attempt = 0
+        while (elapsed := time.monotonic() - start) < _POLL_TIMEOUT:
+            response = await client.get(
+                f"{_BASE_URL}/jobs/recordInfo",
+                params={"taskId": task_id},
+                headers=self._headers,
+                timeout=_TIMEOUT,
+            )
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             record = data.get("data", data)
             state = record.get("state", "").lower()
@@ -120,8 +153,8 @@ class NanoBananaImageGen(ImageGenProvider):
             if state == "success":
                 result_json_str = record.get("resultJson", "")
                 try:
-                    result_obj = json.loads(result_json_str) if result_json_str else {}
-                except (json.JSONDecodeError, TypeError):
+                    result_obj = orjson.loads(result_json_str) if result_json_str else {}
+                except (orjson.JSONDecodeError, TypeError):
                     result_obj = {}
                 urls = result_obj.get("resultUrls", [])
                 if not urls:
@@ -137,21 +170,19 @@ class NanoBananaImageGen(ImageGenProvider):
                 "NanoBanana task pending",
                 task_id=task_id,
                 state=state,
-                elapsed=elapsed,
+                elapsed=round(elapsed, 1),
             )
-            await asyncio.sleep(_POLL_INTERVAL)
-            elapsed += _POLL_INTERVAL
+            delay = min(_POLL_MAX, _POLL_MIN * _POLL_BACKOFF**attempt)
+            await asyncio.sleep(delay + random.uniform(0, _POLL_JITTER))
+            attempt += 1
 
         raise TimeoutError(f"NanoBanana task {task_id} timed out after {_POLL_TIMEOUT}s")
 
     async def _download_image(self, url: str) -> Image.Image:
         """Download an image from a URL and return as PIL Image."""
-        import httpx
-
-        async with httpx.AsyncClient(timeout=60.0) as dl_client:
-            response = await dl_client.get(url)
-            response.raise_for_status()
-            return Image.open(BytesIO(response.content))
+        response = await self._get_client().get(url, timeout=_TIMEOUT)
+        response.raise_for_status()
+        return bytes_to_image(response.content, formats=_RESULT_FORMATS)
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=30))
     async def generate(
@@ -2,19 +2,37 @@
 
 from __future__ import annotations
 
-import base64
 import re
-from io import BytesIO
 from typing import Optional
 
+import httpx
 import structlog
 from PIL import Image
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from paperbanana.core.utils import base64_to_image
 from paperbanana.providers.base import ImageGenProvider
+from paperbanana.providers.http import create_http_client
+from paperbanana.providers.image_gen._cache import GenerationCache
+from paperbanana.providers.image_gen._sizing import aspect_band
 
 logger = structlog.get_logger()
 
+_BASE_URL = "https://openrouter.ai/api/v1"
+# Image generation can take a while
+_TIMEOUT = 180.0
+
+# Indexed by aspect_band
+_ASPECT_RATIO_HINTS = (
+    "tall portrait format (9:16)",
+    "portrait format (2:3)",
+    "square format (1:1)",
+    "landscape format (3:2)",
+    "wide landscape format (16:9)",
+)
+
+_DATA_URL_RE = re.compile(r"data:image/[^;]+;base64,([A-Za-z0-9+/=]+)")
+
 
 class OpenRouterImageGen(ImageGenProvider):
     """Image generation routed through OpenRouter.
@@ -30,10 +48,22 @@ class OpenRouterImageGen(ImageGenProvider):
         self,
         api_key: Optional[str] = None,
         model: str = "google/gemini-3-pro-image-preview",
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache_size: int = 32,
     ):
         self._api_key = api_key
+        self._available = api_key is not None
         self._model = model
-        self._client = None
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "HTTP-Referer": "https://github.com/llmsresearch/paperbanana",
+            "X-Title": "PaperBanana",
+        }
+        # A client passed in is shared with other providers and not closed here
+        self._client = http_client
+        self._owns_client = http_client is None
+        # Seeded requests only; cache_size=0 disables it
+        self._cache = GenerationCache(cache_size)
 
     @property
     def name(self) -> str:
@@ -43,40 +73,30 @@ class OpenRouterImageGen(ImageGenProvider):
     def model_name(self) -> str:
         return self._model
 
-    def _get_client(self):
-        """Lazy-init an async httpx client pointed at the OpenRouter API."""
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared httpx client, or lazily create a private pooled one."""
         if self._client is None:
-            import httpx
-
-            self._client = httpx.AsyncClient(
-                base_url="https://openrouter.ai/api/v1",
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "HTTP-Referer": "https://github.com/llmsresearch/paperbanana",
-                    "X-Title": "PaperBanana",
-                },
-                # Image generation can take a while
-                timeout=180.0,
-            )
+            self._client = create_http_client()
         return self._client
 
     def is_available(self) -> bool:
-        return self._api_key is not None
+        return self._available
+
+    async def preconnect(self) -> None:
+        try:
+            await self._get_client().head(_BASE_URL, timeout=_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.debug("Preconnect failed", provider=self.name, error=str(e))
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
 
     def _aspect_ratio_hint(self, width: int, height: int) -> str:
         """Turn pixel dimensions into a human-readable aspect ratio hint for the prompt."""
-        ratio = width / height
-        if ratio > 1.5:
-            return "wide landscape format (16:9)"
-        if ratio > 1.2:
-            return "landscape format (3:2)"
-        if ratio < 0.67:
-            return "tall portrait format (9:16)"
-        if ratio < 0.83:
-            return "portrait format (2:3)"
-        return "square format (1:1)"
+        return _ASPECT_RATIO_HINTS[aspect_band(width, height)]
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=30))
     async def generate(
         self,
         prompt: str,
@@ -84,6 +104,23 @@ class OpenRouterImageGen(ImageGenProvider):
         width: int = 1024,
         height: int = 1024,
         seed: Optional[int] = None,
+    ) -> Image.Image:
+        # Repeating a seeded request returns the earlier image without an API call
+        key = self._cache.key(prompt, negative_prompt, width, height, seed)
+        image = self._cache.get(key)
+        if image is None:
+            image = await self._generate(prompt, negative_prompt, width, height, seed)
+            self._cache.put(key, image)
+        return image
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=30))
+    async def _generate(
+        self,
+        prompt: str,
+        negative_prompt: Optional[str] = None,
+        width: int = 1024,
+        height: int = 1024,
+        seed: Optional[int] = None,
     ) -> Image.Image:
         client = self._get_client()
 
@@ -106,7 +143,12 @@ class OpenRouterImageGen(ImageGenProvider):
         if seed is not None:
             payload["seed"] = seed
 
-        response = await client.post("/chat/completions", json=payload)
+        response = await client.post(
+            f"{_BASE_URL}/chat/completions",
+            json=payload,
+            headers=self._headers,
+            timeout=_TIMEOUT,
+        )
         response.raise_for_status()
         data = response.json()
 
@@ -118,17 +160,14 @@ class OpenRouterImageGen(ImageGenProvider):
             for img_entry in images:
                 url = img_entry.get("image_url", {}).get("url", "")
                 if url.startswith("data:image/"):
-                    b64_data = url.split(",", 1)[1]
-                    image_bytes = base64.b64decode(b64_data)
-                    return Image.open(BytesIO(image_bytes))
+                    return base64_to_image(url.split(",", 1)[1])
 
         # Fallback: some models inline the base64 data directly in the text content
         content = message.get("content", "")
         if "data:image/" in content:
-            match = re.search(r"data:image/[^;]+;base64,([A-Za-z0-9+/=]+)", content)
+            match = _DATA_URL_RE.search(content)
             if match:
-                image_bytes = base64.b64decode(match.group(1))
-                return Image.open(BytesIO(image_bytes))
+                return base64_to_image(match.group(1))
 
         logger.error("No image data in OpenRouter response", model=self._model)
         raise ValueError(
@@ -2,89 +2,166 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Callable, Optional
+
 import structlog
 
 from paperbanana.core.config import Settings
 from paperbanana.providers.base import ImageGenProvider, VLMProvider
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = structlog.get_logger()
 
+# Provider modules are imported inside each factory, so only the provider
+# actually configured is ever loaded
+
+
+def _gemini_vlm(settings: Settings, http_client: Optional[httpx.AsyncClient]) -> VLMProvider:
+    from paperbanana.providers.vlm.gemini import GeminiVLM
+
+    return GeminiVLM(
+        api_key=settings.google_api_key,
+        model=settings.vlm_model,
+        verify=not settings.skip_ssl_verification,
+        image_format=settings.vlm_image_format,
+    )
+
+
+def _openrouter_vlm(settings: Settings, http_client: Optional[httpx.AsyncClient]) -> VLMProvider:
+    from paperbanana.providers.vlm.openrouter import OpenRouterVLM
+
+    return OpenRouterVLM(
+        api_key=settings.openrouter_api_key,
+        model=settings.vlm_model,
+        base_url=settings.vlm_base_url,
+        http_client=http_client,
+        image_format=settings.vlm_image_format,
+    )
+
+
+def _apicore_vlm(settings: Settings, http_client: Optional[httpx.AsyncClient]) -> VLMProvider:
+    from paperbanana.providers.vlm.openrouter import OpenRouterVLM
+
+    return OpenRouterVLM(
+        api_key=settings.apicore_api_key,
+        model=settings.vlm_model,
+        base_url=settings.vlm_base_url or "https://api.apicore.ai/v1",
+        http_client=http_client,
+        image_format=settings.vlm_image_format,
+    )
+
+
+def _google_imagen(
+    settings: Settings, http_client: Optional[httpx.AsyncClient]
+) -> ImageGenProvider:
+    from paperbanana.providers.image_gen.google_imagen import GoogleImagenGen
+
+    return GoogleImagenGen(
+        api_key=settings.google_api_key,
+        model=settings.image_model,
+        verify=not settings.skip_ssl_verification,
+    )
+
+
+def _openrouter_imagen(
+    settings: Settings, http_client: Optional[httpx.AsyncClient]
+) -> ImageGenProvider:
+    from paperbanana.providers.image_gen.openrouter_imagen import OpenRouterImageGen
+
+    return OpenRouterImageGen(
+        api_key=settings.openrouter_api_key,
+        model=settings.image_model,
+        http_client=http_client,
+    )
+
+
+def _nanobanana(settings: Settings, http_client: Optional[httpx.AsyncClient]) -> ImageGenProvider:
+    from paperbanana.providers.image_gen.nanobanana import NanoBananaImageGen
+
+    return NanoBananaImageGen(
+        api_key=settings.kie_api_key,
+        model=settings.image_model,
+        http_client=http_client,
+    )
+
+
+def _mask_key(key: Optional[str]) -> str:
+    """Shorten an API key for logging, keeping only its first 8 and last 4 characters."""
+    if not key:
+        return "(empty)"
+    if len(key) <= 12:
+        return "(short)"
+    return f"{key[:8]}...{key[-4:]}"
+
+
+_VLM_FACTORIES: dict[str, Callable[[Settings, Optional[httpx.AsyncClient]], VLMProvider]] = {
+    "gemini": _gemini_vlm,
+    "openrouter": _openrouter_vlm,
+    "apicore": _apicore_vlm,
+}
+
+_IMAGE_GEN_FACTORIES: dict[
+    str, Callable[[Settings, Optional[httpx.AsyncClient]], ImageGenProvider]
+] = {
+    "google_imagen": _google_imagen,
+    "openrouter_imagen": _openrouter_imagen,
+    "nanobanana": _nanobanana,
+}
+
 
 class ProviderRegistry:
-    """Factory for creating VLM and image generation providers from config."""
+    """Factory for creating VLM and image generation providers from config.
+
+    Every call builds a new provider. Providers are not cached here because
+    their owner closes them (``PaperBananaPipeline.aclose``) along with the
+    HTTP client they were given; long-running callers reuse whole pipelines
+    instead, as the API's pipeline pool does.
+    """
 
     @staticmethod
-    def create_vlm(settings: Settings) -> VLMProvider:
-        """Create a VLM provider based on settings."""
+    def create_vlm(
+        settings: Settings, http_client: Optional[httpx.AsyncClient] = None
+    ) -> VLMProvider:
+        """Create a VLM provider based on settings.
+
+        Args:
+            settings: Provider selection, model and credentials.
+            http_client: Optional shared client for httpx-based providers.
+        """
         provider = settings.vlm_provider.lower()
-        _key = settings.apicore_api_key or ""
-        _mask = f"{_key[:8]}...{_key[-4:]}" if len(_key) > 12 else ("(empty)" if not _key else "(short)")
+        factory = _VLM_FACTORIES.get(provider)
+        if factory is None:
+            raise ValueError(
+                f"Unknown VLM provider: {provider}. Available: {', '.join(_VLM_FACTORIES)}"
+            )
+
         logger.info(
             "Creating VLM provider",
             provider=provider,
             model=settings.vlm_model,
             base_url=settings.vlm_base_url,
-            apicore_key=_mask,
+            apicore_key=_mask_key(settings.apicore_api_key),
         )
-
-        if provider == "gemini":
-            from paperbanana.providers.vlm.gemini import GeminiVLM
-
-            return GeminiVLM(
-                api_key=settings.google_api_key,
-                model=settings.vlm_model,
-            )
-        elif provider == "openrouter":
-            from paperbanana.providers.vlm.openrouter import OpenRouterVLM
-
-            return OpenRouterVLM(
-                api_key=settings.openrouter_api_key,
-                model=settings.vlm_model,
-                base_url=settings.vlm_base_url,
-            )
-        elif provider == "apicore":
-            from paperbanana.providers.vlm.openrouter import OpenRouterVLM
-
-            return OpenRouterVLM(
-                api_key=settings.apicore_api_key,
-                model=settings.vlm_model,
-                base_url=settings.vlm_base_url or "https://api.apicore.ai/v1",
-            )
-        else:
-            raise ValueError(
-                f"Unknown VLM provider: {provider}. "
-                "Available: gemini, openrouter, apicore"
-            )
+        return factory(settings, http_client)
 
     @staticmethod
-    def create_image_gen(settings: Settings) -> ImageGenProvider:
-        """Create an image generation provider based on settings."""
+    def create_image_gen(
+        settings: Settings, http_client: Optional[httpx.AsyncClient] = None
+    ) -> ImageGenProvider:
+        """Create an image generation provider based on settings.
+
+        Args:
+            settings: Provider selection, model and credentials.
+            http_client: Optional shared client for httpx-based providers.
+        """
         provider = settings.image_provider.lower()
-        logger.info("Creating image gen provider", provider=provider, model=settings.image_model)
-
-        if provider == "google_imagen":
-            from paperbanana.providers.image_gen.google_imagen import GoogleImagenGen
-
-            return GoogleImagenGen(
-                api_key=settings.google_api_key,
-                model=settings.image_model,
-            )
-        elif provider == "openrouter_imagen":
-            from paperbanana.providers.image_gen.openrouter_imagen import OpenRouterImageGen
-
-            return OpenRouterImageGen(
-                api_key=settings.openrouter_api_key,
-                model=settings.image_model,
-            )
-        elif provider == "nanobanana":
-            from paperbanana.providers.image_gen.nanobanana import NanoBananaImageGen
-
-            return NanoBananaImageGen(
-                api_key=settings.kie_api_key,
-                model=settings.image_model,
-            )
-        else:
+        factory = _IMAGE_GEN_FACTORIES.get(provider)
+        if factory is None:
             raise ValueError(
-                f"Unknown image provider: {provider}. "
-                "Available: google_imagen, openrouter_imagen, nanobanana"
+                f"Unknown image provider: {provider}. Available: {', '.join(_IMAGE_GEN_FACTORIES)}"
             )
+
+        logger.info("Creating image gen provider", provider=provider, model=settings.image_model)
+        return factory(settings, http_client)
@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from typing import Optional
 
 import structlog
 from PIL import Image
-from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log
+from tenacity import before_sleep_log, retry, stop_after_attempt, wait_exponential
 
-from paperbanana.core.utils import image_to_base64
+from paperbanana.core.utils import image_to_bytes
 from paperbanana.providers.base import VLMProvider
 
 logger = structlog.get_logger()
-_std_logger = __import__("logging").getLogger(__name__)
+_std_logger = logging.getLogger(__name__)
 
 
 class GeminiVLM(VLMProvider):
@@ -21,9 +23,18 @@ class GeminiVLM(VLMProvider):
     Free tier: https://makersuite.google.com/app/apikey
     """
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-2.0-flash"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-2.0-flash",
+        verify: bool = True,
+        image_format: str = "png",
+    ):
         self._api_key = api_key
         self._model = model
+        self._verify = verify
+        self._image_format = image_format.upper()
+        self._image_mime = f"image/{image_format.lower()}"
         self._client = None
 
     @property
@@ -37,9 +48,9 @@ class GeminiVLM(VLMProvider):
     def _get_client(self):
         if self._client is None:
             try:
-                from google import genai
+                from paperbanana.providers._patched_client import create_genai_client
 
-                self._client = genai.Client(api_key=self._api_key)
+                self._client = create_genai_client(self._api_key, verify=self._verify)
             except ImportError:
                 raise ImportError(
                     "google-genai is required for Gemini provider. "
@@ -50,10 +61,16 @@ class GeminiVLM(VLMProvider):
     def is_available(self) -> bool:
         return self._api_key is not None
 
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aio.aclose()
+            self._client.close()
+            self._client = None
+
     @retry(
         stop=stop_after_attempt(4),
         wait=wait_exponential(min=2, max=30),
-        before_sleep=before_sleep_log(_std_logger, __import__("logging").WARNING),
+        before_sleep=before_sleep_log(_std_logger, logging.WARNING),
     )
     async def generate(
         self,
@@ -68,17 +85,18 @@ class GeminiVLM(VLMProvider):
 
         client = self._get_client()
 
-        contents = []
+        # Text-only calls pass the bare prompt, which the SDK accepts directly
+        contents: str | list = prompt
         if images:
-            for img in images:
-                b64 = image_to_base64(img)
-                contents.append(
-                    types.Part.from_bytes(
-                        data=__import__("base64").b64decode(b64),
-                        mime_type="image/png",
-                    )
-                )
-        contents.append(prompt)
+            # Raw encoded bytes go straight to the SDK; no base64 step is needed.
+            # Encoding runs off the event loop, one thread per image
+            encoded = await asyncio.gather(
+                *(asyncio.to_thread(image_to_bytes, img, self._image_format) for img in images)
+            )
+            contents = [
+                *(types.Part.from_bytes(data=data, mime_type=self._image_mime) for data in encoded),
+                prompt,
+            ]
 
         config = types.GenerateContentConfig(
             temperature=temperature,
@@ -89,7 +107,8 @@ class GeminiVLM(VLMProvider):
         if response_format == "json":
             config.response_mime_type = "application/json"
 
-        response = client.models.generate_content(
+        # The SDK's async surface keeps the event loop free during the call
+        response = await client.aio.models.generate_content(
             model=self._model,
             contents=contents,
             config=config,
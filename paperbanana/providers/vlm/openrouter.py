@@ -2,17 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
+import httpx
+import orjson
 import structlog
 from PIL import Image
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 from paperbanana.core.utils import image_to_base64
 from paperbanana.providers.base import VLMProvider
+from paperbanana.providers.http import create_http_client
 
 logger = structlog.get_logger()
 
+# Completions can be slow to start streaming back, but an unreachable host
+# should fail fast so tenacity can retry on a fresh connection
+_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+# Rate limits and gateway errors clear up on their own; other 4xx responses
+# (bad key, bad payload) fail the same way on every attempt
+_RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Whether a failed request is worth repeating: transport errors and transient statuses."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
 
 class OpenRouterVLM(VLMProvider):
     """VLM provider that routes through OpenRouter's OpenAI-compatible API.
@@ -26,11 +45,24 @@ class OpenRouterVLM(VLMProvider):
         api_key: Optional[str] = None,
         model: str = "google/gemini-3-flash-preview",
         base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        image_format: str = "png",
     ):
         self._api_key = api_key
         self._model = model
-        self._base_url = base_url or "https://openrouter.ai/api/v1"
-        self._client = None
+        self._image_format = image_format.upper()
+        self._data_url_prefix = f"data:image/{image_format.lower()};base64,"
+        self._base_url = (base_url or "https://openrouter.ai/api/v1").rstrip("/")
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "HTTP-Referer": "https://github.com/llmsresearch/paperbanana",
+            "X-Title": "PaperBanana",
+            # Bodies are serialized with orjson rather than httpx's json=
+            "Content-Type": "application/json",
+        }
+        # A client passed in is shared with other providers and not closed here
+        self._client = http_client
+        self._owns_client = http_client is None
 
     @property
     def name(self) -> str:
@@ -40,26 +72,30 @@ class OpenRouterVLM(VLMProvider):
     def model_name(self) -> str:
         return self._model
 
-    def _get_client(self):
-        """Lazy-init an async httpx client pointed at the OpenRouter API."""
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared httpx client, or lazily create a private pooled one.
+
+        Auth travels in per-request headers, so one client can serve
+        instances with different keys and base URLs.
+        """
         if self._client is None:
-            import httpx
-
-            self._client = httpx.AsyncClient(
-                base_url=self._base_url,
-                headers={
-                    "Authorization": f"Bearer {self._api_key}",
-                    "HTTP-Referer": "https://github.com/llmsresearch/paperbanana",
-                    "X-Title": "PaperBanana",
-                },
-                timeout=120.0,
-            )
+            self._client = create_http_client()
         return self._client
 
     def is_available(self) -> bool:
         return self._api_key is not None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=30))
+    async def aclose(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=2, max=30),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
     async def generate(
         self,
         prompt: str,
@@ -78,12 +114,16 @@ class OpenRouterVLM(VLMProvider):
         # Build multimodal content array (vision images + text)
         content = []
         if images:
-            for img in images:
-                b64 = image_to_base64(img)
+            # Encode off the event loop; PIL releases the GIL while compressing,
+            # so several images encode in parallel
+            encoded = await asyncio.gather(
+                *(asyncio.to_thread(image_to_base64, img, self._image_format) for img in images)
+            )
+            for b64 in encoded:
                 content.append(
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{b64}"},
+                        "image_url": {"url": self._data_url_prefix + b64},
                     }
                 )
         content.append({"type": "text", "text": prompt})
@@ -99,15 +139,21 @@ class OpenRouterVLM(VLMProvider):
         if response_format == "json":
             payload["response_format"] = {"type": "json_object"}
 
-        response = await client.post("chat/completions", json=payload)
+        response = await client.post(
+            f"{self._base_url}/chat/completions",
+            content=orjson.dumps(payload),
+            headers=self._headers,
+            timeout=_TIMEOUT,
+        )
         response.raise_for_status()
 
-        data = response.json()
+        data = orjson.loads(response.content)
         text = data["choices"][0]["message"]["content"]
 
         logger.debug(
             "OpenRouter response",
             model=self._model,
+            http_version=response.http_version,
             usage=data.get("usage"),
         )
         return text
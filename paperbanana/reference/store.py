@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import json
+import os
+import threading
 from pathlib import Path
 from typing import Optional
 
+import orjson
 import structlog
 
 from paperbanana.core.types import ReferenceExample
@@ -22,27 +24,49 @@ class ReferenceStore:
     def __init__(self, path: str | Path):
         self.path = Path(path)
         self._examples: list[ReferenceExample] = []
+        # Lookup indices over _examples, filled by _index()
+        self._by_id: dict[str, ReferenceExample] = {}
+        self._by_category: dict[Optional[str], list[ReferenceExample]] = {}
         self._loaded = False
+        # Guards the first load when threads share a store
+        self._lock = threading.Lock()
+
+    def _index(self) -> None:
+        """Build the ID and category indices from the loaded examples."""
+        self._by_id = {}
+        self._by_category = {}
+        for e in self._examples:
+            # The first example wins on duplicate IDs, as a linear scan would
+            self._by_id.setdefault(e.id, e)
+            self._by_category.setdefault(e.category, []).append(e)
 
     def _load(self) -> None:
-        """Load reference examples from the store directory."""
+        """Load reference examples from the store directory, once."""
+        # Unlocked fast path; the flag is only set after the indices are built
         if self._loaded:
             return
 
+        with self._lock:
+            if not self._loaded:
+                self._read_index()
+                self._loaded = True
+
+    def _read_index(self) -> None:
+        """Read index.json into the example list and its indices."""
         index_file = self.path / "index.json"
         if not index_file.exists():
             logger.warning("No reference index found", path=str(self.path))
-            self._loaded = True
             return
 
-        with open(index_file) as f:
-            data = json.load(f)
+        data = orjson.loads(index_file.read_bytes())
 
+        store_dir = str(self.path)
         for item in data.get("examples", []):
-            # Resolve image path relative to store directory
+            # Resolve image path relative to store directory; string ops avoid
+            # building two Path objects per example
             image_path = item.get("image_path", "")
-            if image_path and not Path(image_path).is_absolute():
-                image_path = str(self.path / image_path)
+            if image_path and not os.path.isabs(image_path):
+                image_path = os.path.join(store_dir, image_path)
 
             self._examples.append(
                 ReferenceExample(
@@ -54,8 +78,8 @@ class ReferenceStore:
                 )
             )
 
+        self._index()
         logger.info("Loaded reference examples", count=len(self._examples))
-        self._loaded = True
 
     def get_all(self) -> list[ReferenceExample]:
         """Get all reference examples."""
@@ -65,15 +89,12 @@ class ReferenceStore:
     def get_by_category(self, category: str) -> list[ReferenceExample]:
         """Get reference examples filtered by category."""
         self._load()
-        return [e for e in self._examples if e.category == category]
+        return list(self._by_category.get(category, ()))
 
     def get_by_id(self, example_id: str) -> Optional[ReferenceExample]:
         """Get a specific reference example by ID."""
         self._load()
-        for e in self._examples:
-            if e.id == example_id:
-                return e
-        return None
+        return self._by_id.get(example_id)
 
     @property
     def count(self) -> int:
@@ -105,11 +126,11 @@ class ReferenceStore:
             "examples": [e.model_dump() for e in examples],
         }
 
-        with open(path / "index.json", "w") as f:
-            json.dump(data, f, indent=2)
+        (path / "index.json").write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         logger.info("Created reference store", path=str(path), count=len(examples))
         store = ReferenceStore(path)
         store._examples = examples
+        store._index()
         store._loaded = True
         return store
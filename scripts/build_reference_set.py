@@ -30,6 +30,8 @@ import re
 import shutil
 from pathlib import Path
 
+import orjson
+
 # Section title patterns that indicate methodology content
 METHOD_PATTERNS = [
     r"^\d*\.?\s*method(ology)?",
@@ -58,6 +60,26 @@ STOP_PATTERNS = [
     r"^\d*\.?\s*broader\s+impact",
 ]
 
+# Patterns for sections that come BEFORE the method
+PRE_PATTERNS = [
+    r"^\d*\.?\s*introduction",
+    r"^\d*\.?\s*preliminar",
+    r"^\d*\.?\s*background",
+    r"^\d*\.?\s*problem\s+(statement|formulation|setup|definition)",
+    r"^\d*\.?\s*notation",
+    r"^\d*\.?\s*setup",
+]
+
+
+def _compile_any(patterns: list[str]) -> re.Pattern[str]:
+    """Join patterns into one alternation, so a heading is matched in a single call."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+_METHOD_RE = _compile_any(METHOD_PATTERNS)
+_STOP_RE = _compile_any(STOP_PATTERNS)
+_PRE_RE = _compile_any(PRE_PATTERNS)
+
 CATEGORIES = [
     "agent_reasoning",
     "vision_perception",
@@ -68,20 +90,22 @@ CATEGORIES = [
 
 def is_method_heading(text: str) -> bool:
     """Check if heading text indicates a methodology section."""
-    lower = text.lower().strip()
-    return any(re.match(p, lower) for p in METHOD_PATTERNS)
+    return _METHOD_RE.match(text.lower().strip()) is not None
 
 
 def is_stop_heading(text: str) -> bool:
     """Check if heading text indicates the method section has ended."""
-    lower = text.lower().strip()
-    return any(re.match(p, lower) for p in STOP_PATTERNS)
+    return _STOP_RE.match(text.lower().strip()) is not None
 
 
 def get_section_number(text: str) -> int | None:
     """Extract top-level section number from heading (e.g., '3' from '3. Method')."""
-    match = re.match(r"^(\d+)", text.strip())
-    return int(match.group(1)) if match else None
+    # Plain str scan; isdecimal() accepts the same characters as the \d class
+    s = text.strip()
+    i = 0
+    while i < len(s) and s[i].isdecimal():
+        i += 1
+    return int(s[:i]) if i else None
 
 
 def compute_aspect_ratio(bbox: list[float]) -> float:
@@ -143,16 +167,6 @@ def _find_method_sections_by_position(headings: list[dict]) -> list[int]:
     "4 Just GRPO") rather than using "Methodology". This heuristic finds
     top-level sections between intro/prelim and experiments/results.
     """
-    # Patterns for sections that come BEFORE the method
-    pre_patterns = [
-        r"^\d*\.?\s*introduction",
-        r"^\d*\.?\s*preliminar",
-        r"^\d*\.?\s*background",
-        r"^\d*\.?\s*problem\s+(statement|formulation|setup|definition)",
-        r"^\d*\.?\s*notation",
-        r"^\d*\.?\s*setup",
-    ]
-
     # Find the last pre-method section number and first post-method section
     last_pre_num = None
     first_post_num = None
@@ -164,11 +178,9 @@ def _find_method_sections_by_position(headings: list[dict]) -> list[int]:
         text_lower = h["text"].lower().strip()
 
         # Check pre-method patterns
-        for p in pre_patterns:
-            if re.match(p, text_lower):
-                if last_pre_num is None or sec_num > last_pre_num:
-                    last_pre_num = sec_num
-                break
+        if _PRE_RE.match(text_lower):
+            if last_pre_num is None or sec_num > last_pre_num:
+                last_pre_num = sec_num
 
         # Check post-method (stop) patterns
         if is_stop_heading(h["text"]):
@@ -182,6 +194,30 @@ def _find_method_sections_by_position(headings: list[dict]) -> list[int]:
     return list(range(last_pre_num + 1, first_post_num))
 
 
+def _parse_figure(item: dict, base_dir: Path) -> dict | None:
+    """Build a figure record from an image item, or None if its file is missing."""
+    img_path = item.get("img_path", "")
+    captions = item.get("image_caption", [])
+    caption = captions[0].strip() if captions else ""
+    bbox = item.get("bbox", [])
+
+    if not img_path:
+        return None
+
+    # Resolve to absolute path
+    abs_img_path = base_dir / img_path
+    if not abs_img_path.exists():
+        return None
+
+    return {
+        "caption": caption,
+        "local_path": abs_img_path,
+        "img_path": img_path,
+        "aspect_ratio": compute_aspect_ratio(bbox),
+        "bbox": bbox,
+    }
+
+
 def parse_content_list(content_list_path: Path) -> dict:
     """Parse a MinerU content_list.json and extract title, methodology, figures.
 
@@ -192,10 +228,8 @@ def parse_content_list(content_list_path: Path) -> dict:
     """
     base_dir = content_list_path.parent
 
-    with open(content_list_path) as f:
-        items = json.load(f)
+    items = orjson.loads(content_list_path.read_bytes())
 
-    # 1. Extract paper title
     skip_titles = {
         "abstract", "contents", "table of contents", "references",
         "acknowledgment", "acknowledgments", "acknowledgement",
@@ -203,37 +237,47 @@ def parse_content_list(content_list_path: Path) -> dict:
         "introduction", "conclusion", "conclusions",
         "related work", "limitations", "broader impact",
     }
-    paper_title = ""
 
-    # First try: text items with text_level that aren't numbered sections
-    for item in items:
-        if item.get("type") == "text" and item.get("text_level") == 1:
-            text = item.get("text", "").strip()
-            # Skip numbered sections ("1.", "1 ", "A.", "A.1") and common headings
-            lower = text.lower()
-            is_section = re.match(r"^(\d+|[A-Z]\.?\d*)[\.\s]", text)
-            is_skip = any(lower.startswith(s) for s in skip_titles)
-            if not is_section and not is_skip:
-                paper_title = text
-                break
-
-    # Fallback: check header items for the paper title (some parsers put it there)
-    if not paper_title:
-        for item in items:
-            if item.get("type") == "header":
-                text = item.get("text", "").strip()
-                # Paper titles are typically >20 chars and not just logos/dates
-                if len(text) > 20 and not re.match(r"^\d+\.", text):
-                    paper_title = text
-                    break
-
-    # 2. Collect all top-level headings for positional analysis
+    # 1-2. One pass collects the title candidates, the headings for
+    # positional analysis and the figures; only the methodology text needs
+    # a second pass, once the method sections are known
+    title_candidate = None
+    header_title = ""
     headings = []
+    figures = []
+
     for item in items:
-        if item.get("text_level") and item.get("text", "").strip():
-            text = item["text"].strip()
-            sec_num = get_section_number(text)
-            headings.append({"text": text, "sec_num": sec_num})
+        item_type = item.get("type")
+
+        if item_type == "image":
+            figure = _parse_figure(item, base_dir)
+            if figure is not None:
+                figures.append(figure)
+
+        # Only headings and header items carry text this pass reads
+        text_level = item.get("text_level")
+        if text_level:
+            text = item.get("text", "").strip()
+            if text:
+                headings.append({"text": text, "sec_num": get_section_number(text)})
+
+            # First try: the first text item with text_level 1 that isn't a
+            # numbered section ("1.", "1 ", "A.", "A.1") or a common heading
+            if title_candidate is None and item_type == "text" and text_level == 1:
+                lower = text.lower()
+                is_section = re.match(r"^(\d+|[A-Z]\.?\d*)[\.\s]", text)
+                is_skip = any(lower.startswith(s) for s in skip_titles)
+                if not is_section and not is_skip:
+                    title_candidate = text
+
+        # Fallback: header items (some parsers put the title there). Paper
+        # titles are typically >20 chars and not just logos/dates
+        if not header_title and item_type == "header":
+            text = item.get("text", "").strip()
+            if len(text) > 20 and not re.match(r"^\d+\.", text):
+                header_title = text
+
+    paper_title = title_candidate or header_title
 
     # 3. Determine which sections are methodology
     # First try explicit METHOD_PATTERNS, then fall back to positional
@@ -256,8 +300,13 @@ def parse_content_list(content_list_path: Path) -> dict:
 
     for item in items:
         item_type = item.get("type", "")
-        text = item.get("text", "").strip()
         text_level = item.get("text_level")
+        # Images and lists carry no text this pass reads
+        text = (
+            item.get("text", "").strip()
+            if text_level or item_type in ("text", "equation")
+            else ""
+        )
 
         # Headings in content_list.json are text items with text_level
         if text_level and text:
@@ -304,35 +353,6 @@ def parse_content_list(content_list_path: Path) -> dict:
 
     methodology_text = "\n\n".join(methodology_parts)
 
-    # 4. Extract all figures with captions and aspect ratios
-    figures = []
-    for item in items:
-        if item.get("type") != "image":
-            continue
-
-        img_path = item.get("img_path", "")
-        captions = item.get("image_caption", [])
-        caption = captions[0].strip() if captions else ""
-        bbox = item.get("bbox", [])
-
-        if not img_path:
-            continue
-
-        # Resolve to absolute path
-        abs_img_path = base_dir / img_path
-        if not abs_img_path.exists():
-            continue
-
-        ratio = compute_aspect_ratio(bbox)
-
-        figures.append({
-            "caption": caption,
-            "local_path": abs_img_path,
-            "img_path": img_path,
-            "aspect_ratio": ratio,
-            "bbox": bbox,
-        })
-
     return {
         "title": paper_title,
         "methodology_text": methodology_text,
@@ -394,15 +414,20 @@ def identify_methodology_figures(
     return candidates
 
 
+def _is_ascii_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
 def generate_paper_id(title: str, dir_name: str) -> str:
     """Generate a clean ID from paper title, falling back to directory name."""
     if title:
-        words = re.sub(r"[^a-zA-Z0-9\s]", "", title).lower().split()[:5]
-        slug = "_".join(words)
+        # Keep ASCII letters, digits and whitespace
+        kept = "".join(ch for ch in title if _is_ascii_alnum(ch) or ch.isspace())
+        slug = "_".join(kept.lower().split()[:5])
         if slug:
             return slug
     # Fall back to directory name (e.g., "2601.15165v2")
-    return re.sub(r"[^a-zA-Z0-9]", "_", dir_name).strip("_")
+    return "".join(ch if _is_ascii_alnum(ch) else "_" for ch in dir_name).strip("_")
 
 
 def guess_category(title: str, methodology_text: str) -> str:
@@ -0,0 +1,85 @@
+"""Tests for shared BaseAgent behaviour."""
+
+from __future__ import annotations
+
+import pytest
+
+from paperbanana.agents.base import BaseAgent, _read_prompt
+
+
+class _EchoAgent(BaseAgent):
+    @property
+    def agent_name(self) -> str:
+        return "echo"
+
+    async def run(self, **kwargs):
+        return self.format_prompt(self.load_prompt(), **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _clear_prompt_cache():
+    _read_prompt.cache_clear()
+    yield
+    _read_prompt.cache_clear()
+
+
+def test_load_prompt_reads_file_once(tmp_path):
+    """Repeated loads are served from the cache, not the filesystem."""
+    (tmp_path / "diagram").mkdir()
+    path = tmp_path / "diagram" / "echo.txt"
+    path.write_text("Hello {name}", encoding="utf-8")
+
+    agent = _EchoAgent(vlm_provider=None, prompt_dir=str(tmp_path))
+    assert agent.load_prompt() == "Hello {name}"
+
+    path.write_text("changed", encoding="utf-8")
+    assert agent.load_prompt() == "Hello {name}"
+    # The agent's own cache answers without touching the shared one
+    assert _read_prompt.cache_info().misses == 1
+    assert _read_prompt.cache_info().hits == 0
+
+    other = _EchoAgent(vlm_provider=None, prompt_dir=str(tmp_path))
+    assert other.load_prompt() == "Hello {name}"
+    assert _read_prompt.cache_info().hits == 1
+
+
+def test_load_prompt_missing_file(tmp_path):
+    agent = _EchoAgent(vlm_provider=None, prompt_dir=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        agent.load_prompt("plot")
+
+
+async def test_format_prompt(tmp_path):
+    (tmp_path / "diagram").mkdir()
+    (tmp_path / "diagram" / "echo.txt").write_text("Hello {name}", encoding="utf-8")
+
+    agent = _EchoAgent(vlm_provider=None, prompt_dir=str(tmp_path))
+    assert await agent.run(name="world") == "Hello world"
+
+
+def test_format_prompt_reuses_rendered_head():
+    """The part before the final placeholder is rendered once per set of values."""
+    agent = _EchoAgent(vlm_provider=None)
+    template = "{guide} | {{literal}} {context}\n{description} {{done}}"
+    context = "source " * 100
+
+    heads = []
+    for description in ("first", "second"):
+        expected = template.format_map(
+            {"guide": "g", "context": context, "description": description}
+        )
+        assert (
+            agent.format_prompt(template, guide="g", context=context, description=description)
+            == expected
+        )
+        heads.append(agent._rendered_head[2])
+    assert heads[0] is heads[1]
+
+    # Only the latest head is kept, and a new run drops it
+    agent.format_prompt(template, guide="other", context=context, description="x")
+    assert agent._rendered_head[1] == ("other", context)
+    agent.clear_prompt_cache()
+    assert agent._rendered_head is None
+
+    with pytest.raises(KeyError):
+        agent.format_prompt(template, guide="g", description="x")
@@ -0,0 +1,27 @@
+"""Tests for the Critic agent's response parsing."""
+
+from __future__ import annotations
+
+from paperbanana.agents.critic import CriticAgent
+
+
+def test_parse_response_valid_json():
+    critic = CriticAgent(vlm_provider=None)
+    result = critic._parse_response(
+        '{"critic_suggestions": ["Label the encoder"], "revised_description": "New"}'
+    )
+    assert result.critic_suggestions == ["Label the encoder"]
+    assert result.revised_description == "New"
+    assert result.needs_revision
+
+
+def test_parse_response_invalid_json_means_no_revision():
+    critic = CriticAgent(vlm_provider=None)
+    result = critic._parse_response("not json")
+    assert result.critic_suggestions == []
+    assert not result.needs_revision
+
+
+def test_parse_response_non_object_means_no_revision():
+    critic = CriticAgent(vlm_provider=None)
+    assert not critic._parse_response('["a", "b"]').needs_revision
@@ -0,0 +1,75 @@
+"""Tests for the Planner agent's reference image loading."""
+
+from __future__ import annotations
+
+import os
+
+from PIL import Image
+
+from paperbanana.agents.planner import PlannerAgent
+from paperbanana.core.types import ReferenceExample
+
+
+def _example(i: int, image_path: str) -> ReferenceExample:
+    return ReferenceExample(
+        id=f"ref_{i}", source_context="context", caption="caption", image_path=image_path
+    )
+
+
+async def test_load_example_images_keeps_order_and_skips_bad_files(tmp_path):
+    red = tmp_path / "red.png"
+    blue = tmp_path / "blue.png"
+    broken = tmp_path / "broken.png"
+    Image.new("RGB", (2, 2), "red").save(red)
+    Image.new("RGB", (3, 3), "blue").save(blue)
+    broken.write_bytes(b"not a png")
+
+    examples = [
+        _example(0, str(red)),
+        _example(1, str(tmp_path / "missing.png")),
+        _example(2, str(broken)),
+        _example(3, str(blue)),
+    ]
+    images = await PlannerAgent(vlm_provider=None)._load_example_images(examples)
+    assert [img.size for img in images] == [(2, 2), (3, 3)]
+
+
+async def test_load_example_images_reuses_decoded_images(tmp_path):
+    examples = []
+    for i in range(10):
+        path = tmp_path / f"ref_{i}.png"
+        Image.new("RGB", (2, 2), "red").save(path)
+        examples.append(_example(i, str(path)))
+
+    planner = PlannerAgent(vlm_provider=None)
+    first = await planner._load_example_images(examples)
+    second = await planner._load_example_images(examples)
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_has_valid_image_sees_directory_changes(tmp_path):
+    planner = PlannerAgent(vlm_provider=None)
+    example = _example(0, str(tmp_path / "late.png"))
+    assert not planner._has_valid_image(example)
+    assert not planner._has_valid_image(_example(1, str(tmp_path / "nodir" / "x.png")))
+    assert not planner._has_valid_image(_example(2, ""))
+
+    Image.new("RGB", (2, 2)).save(tmp_path / "late.png")
+    # Force a visible mtime change on filesystems with coarse timestamps
+    stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert planner._has_valid_image(example)
+
+
+async def test_run_settles_image_loading_when_prompt_fails(tmp_path):
+    import asyncio
+
+    import pytest
+
+    path = tmp_path / "ref.png"
+    Image.new("RGB", (2, 2)).save(path)
+    planner = PlannerAgent(vlm_provider=None, prompt_dir=str(tmp_path / "no_prompts"))
+
+    with pytest.raises(FileNotFoundError):
+        await planner.run("context", "caption", [_example(0, str(path))])
+    assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
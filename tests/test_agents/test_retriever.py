@@ -125,3 +125,54 @@ async def test_retriever_handles_malformed_json():
 
     # Should fall back to candidates, truncated to num_examples
     assert len(result) == 3
+
+
+@pytest.mark.asyncio
+async def test_retriever_recovers_ids_from_invalid_json():
+    """A trailing comma in the reply does not discard the selection."""
+    response = 'Here you go:\n```json\n{"selected_ids": ["ref_004", "ref_002",],}\n```'
+    vlm = MockVLM(response=response)
+    agent = RetrieverAgent(vlm)
+    candidates = _make_examples(5)
+
+    result = await agent.run(
+        source_context="test",
+        caption="test",
+        candidates=candidates,
+        num_examples=3,
+    )
+
+    assert [r.id for r in result] == ["ref_004", "ref_002"]
+
+
+class RecordingVLM(MockVLM):
+    """Mock VLM that remembers the last prompt it received."""
+
+    async def generate(self, prompt, **kwargs):
+        self.prompt = prompt
+        return self._response
+
+
+@pytest.mark.asyncio
+async def test_retriever_prefilters_large_pools():
+    """Large pools are shortlisted lexically before the VLM sees them."""
+    candidates = _make_examples(20)
+    candidates[17] = ReferenceExample(
+        id="ref_gnn",
+        source_context="A graph neural network with message passing layers.",
+        caption="Graph neural network architecture",
+        image_path="images/gnn.png",
+    )
+    vlm = RecordingVLM(response=json.dumps({"selected_ids": ["ref_gnn"]}))
+    agent = RetrieverAgent(vlm)
+
+    result = await agent.run(
+        source_context="We propose a graph neural network using message passing.",
+        caption="Overview of our graph network",
+        candidates=candidates,
+        num_examples=2,
+    )
+
+    assert [r.id for r in result] == ["ref_gnn"]
+    assert vlm.prompt.count("Candidate Paper") == 6
+    assert "Candidate Paper 1:\n- **Paper ID:** ref_gnn" in vlm.prompt
@@ -0,0 +1,116 @@
+"""Tests for the Visualizer agent's plot execution."""
+
+from __future__ import annotations
+
+import pytest
+
+from paperbanana.agents.visualizer import VisualizerAgent
+
+_PLOT_CODE = """
+import matplotlib.pyplot as plt
+plt.plot([1, 2, 3], [3, 1, 2])
+plt.savefig(OUTPUT_PATH)
+"""
+
+
+@pytest.fixture
+def visualizer():
+    agent = VisualizerAgent(image_gen=None, vlm_provider=None)
+    yield agent
+    agent.close()
+
+
+def test_plot_worker_runs_successive_plots(visualizer, tmp_path):
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    assert visualizer._execute_plot_code(_PLOT_CODE, str(first))
+    assert visualizer._execute_plot_code(_PLOT_CODE, str(second))
+    assert first.exists() and second.exists()
+
+
+def test_plot_worker_started_ahead_runs_plots(visualizer, tmp_path):
+    worker = visualizer._get_plot_worker()
+    worker.start()
+    proc = worker._proc
+    code = "import numpy as np\n" + _PLOT_CODE
+    assert visualizer._execute_plot_code(code, str(tmp_path / "plot.png"))
+    assert worker._proc is proc
+
+
+def test_plot_worker_recovers_from_failing_code(visualizer, tmp_path):
+    assert not visualizer._execute_plot_code("raise ValueError('bad')", str(tmp_path / "a.png"))
+    assert not visualizer._execute_plot_code("import os; os._exit(1)", str(tmp_path / "b.png"))
+    assert visualizer._execute_plot_code(_PLOT_CODE, str(tmp_path / "c.png"))
+
+
+def test_output_path_assignment_is_overridden(visualizer, tmp_path):
+    code = 'OUTPUT_PATH = "elsewhere.png"\n' + _PLOT_CODE
+    out = tmp_path / "plot.png"
+    assert visualizer._execute_plot_code(code, str(out))
+    assert out.exists()
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        ("```python\nprint(1)\n```", "print(1)"),
+        ("Setup:\n```bash\npip install x\n```\nCode:\n```python\nprint(2)\n```", "print(2)"),
+        ("```\nprint(3)\n```", "print(3)"),
+        ("  print(4)  ", "print(4)"),
+        ("```python\nprint(5)", "```python\nprint(5)"),
+    ],
+)
+def test_extract_code(visualizer, response, expected):
+    assert visualizer._extract_code(response) == expected
+
+
+def test_large_plot_data_is_loaded_from_data_path(tmp_path):
+    agent = VisualizerAgent(image_gen=None, vlm_provider=None, output_dir=str(tmp_path))
+    raw_data = {"data": [{"x": i, "y": i * i} for i in range(500)]}
+
+    data_path = agent._write_plot_data(raw_data)
+    description = agent._describe_plot_data(raw_data, data_path)
+    assert "DATA_PATH" in description
+    assert "`data`: 500 items" in description
+    assert '"x": 499' not in description
+
+    code = (
+        "import json\n"
+        "import matplotlib.pyplot as plt\n"
+        'rows = json.load(open(DATA_PATH))["data"]\n'
+        'plt.plot([r["x"] for r in rows], [r["y"] for r in rows])\n'
+        "plt.savefig(OUTPUT_PATH)\n"
+    )
+    try:
+        assert agent._execute_plot_code(code, str(tmp_path / "plot.png"), str(data_path))
+    finally:
+        agent.close()
+
+
+def test_small_plot_data_is_inlined(visualizer, tmp_path):
+    visualizer.output_dir = tmp_path
+    raw_data = {"data": [{"x": 1, "y": 2}]}
+    data_path = visualizer._write_plot_data(raw_data)
+    description = visualizer._describe_plot_data(raw_data, data_path)
+    assert description.startswith("\n\n## Raw Data\n")
+    assert '{"data":[{"x":1,"y":2}]}' in description
+
+
+def test_plot_data_file_follows_new_data(visualizer, tmp_path):
+    visualizer.output_dir = tmp_path
+    first = visualizer._write_plot_data({"data": [1, 2]})
+    assert visualizer._write_plot_data({"data": [1, 2]}) == first
+
+    second = visualizer._write_plot_data({"data": [3]})
+    assert second != first
+    assert second.read_bytes() == b'{"data":[3]}'
+
+
+def test_plot_prompt_ends_with_description(visualizer):
+    template = visualizer.load_prompt("plot")
+    first = visualizer.format_prompt(template, raw_data="\n\nDATA", description="round one")
+    second = visualizer.format_prompt(template, raw_data="\n\nDATA", description="round two")
+    prefix = first.rstrip().removesuffix("round one")
+    assert prefix.endswith("## Plot Description\n")
+    assert "DATA" in prefix
+    assert second.startswith(prefix)
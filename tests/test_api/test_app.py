@@ -0,0 +1,83 @@
+"""Tests for API request helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from api import app as api_app  # noqa: E402
+
+
+def test_rate_limiter_counts_per_client(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(api_app.time, "monotonic", lambda: now[0])
+    limiter = api_app._RateLimiter(limit=2, window=60.0)
+
+    assert limiter.allow("a")
+    assert limiter.allow("a")
+    assert not limiter.allow("a")
+    assert limiter.allow("b")
+
+    now[0] = 60.0
+    assert limiter.allow("a")
+
+
+def test_etag_matches():
+    assert api_app._etag_matches('"abc"', '"abc"')
+    assert api_app._etag_matches('"x", W/"abc"', '"abc"')
+    assert api_app._etag_matches("*", '"abc"')
+    assert not api_app._etag_matches(None, '"abc"')
+    assert not api_app._etag_matches('"other"', '"abc"')
+
+
+async def test_concurrent_image_requests_share_one_etag(tmp_path, monkeypatch):
+    """Requests racing on a task's first image download all get its ETag."""
+    import asyncio
+    import time
+
+    import httpx
+
+    from api.schemas import GenerateRequest, TaskResult, TaskStatus
+    from api.tasks import TaskManager
+    from paperbanana.core.config import Settings
+
+    async def _skip_execution(self, state) -> None:
+        pass
+
+    monkeypatch.setattr(TaskManager, "_execute", _skip_execution)
+    image = tmp_path / "final_output.png"
+    image.write_bytes(b"\x89PNG fake image")
+    manager = TaskManager(Settings())
+    task_id = manager.submit(GenerateRequest(source_context="c", communicative_intent="i"))
+    state = await manager.get(task_id)
+    state.status = TaskStatus.COMPLETED
+    state.result = TaskResult(
+        image_url="/img",
+        run_id="run_1",
+        description="d",
+        total_iterations=1,
+        metadata={"image_path": str(image)},
+    )
+    monkeypatch.setattr(api_app, "_task_manager", manager)
+
+    sha256_file = api_app._sha256_file
+
+    def slow_sha256_file(path):
+        time.sleep(0.2)
+        return sha256_file(path)
+
+    monkeypatch.setattr(api_app, "_sha256_file", slow_sha256_file)
+
+    async def get_after(client, url, delay):
+        await asyncio.sleep(delay)
+        return await client.get(url)
+
+    transport = httpx.ASGITransport(app=api_app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        url = f"/api/v1/tasks/{task_id}/image"
+        # The later requests arrive while the first is still hashing
+        responses = await asyncio.gather(*(get_after(client, url, d) for d in (0, 0.1, 0.1)))
+
+    assert [r.status_code for r in responses] == [200] * 3
+    assert len({r.headers["etag"] for r in responses}) == 1
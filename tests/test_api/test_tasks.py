@@ -0,0 +1,147 @@
+"""Tests for the API task manager."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from api import tasks  # noqa: E402
+from api.schemas import GenerateRequest, TaskResult, TaskStatus  # noqa: E402
+from api.tasks import TaskManager  # noqa: E402
+from paperbanana.core.config import Settings  # noqa: E402
+
+
+def _request() -> GenerateRequest:
+    return GenerateRequest(source_context="context", communicative_intent="caption")
+
+
+async def _skip_execution(self, state) -> None:
+    """Stand-in for TaskManager._execute so workers never run a real pipeline."""
+
+
+async def _finish(manager: TaskManager, task_id: str, age_seconds: float = 0.0) -> None:
+    state = await manager.get(task_id)
+    state.status = TaskStatus.COMPLETED
+    state.completed_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=age_seconds
+    )
+
+
+async def test_submit_evicts_oldest_finished_task(monkeypatch):
+    """At capacity, the least recently used finished task is forgotten."""
+    monkeypatch.setattr(tasks, "_MAX_TASKS", 3)
+    manager = TaskManager(Settings())
+    first, second, third = (manager.submit(_request()) for _ in range(3))
+    await _finish(manager, first)
+    await _finish(manager, second)
+    await manager.get(first)  # touch: second is now least recently used
+
+    fourth = manager.submit(_request())
+
+    assert await manager.get(second) is None
+    assert await manager.get(first) is not None
+    assert await manager.get(third) is not None
+    assert await manager.get(fourth) is not None
+
+
+async def test_submit_never_evicts_pending_tasks(monkeypatch):
+    """Pending tasks are kept even when the store is over capacity."""
+    monkeypatch.setattr(tasks, "_MAX_TASKS", 2)
+    manager = TaskManager(Settings())
+    ids = [manager.submit(_request()) for _ in range(3)]
+
+    for task_id in ids:
+        assert await manager.get(task_id) is not None
+
+
+async def test_expire_finished_drops_only_old_finished_tasks():
+    """TTL expiry removes finished tasks older than the TTL."""
+    manager = TaskManager(Settings())
+    old, recent, pending = (manager.submit(_request()) for _ in range(3))
+    await _finish(manager, old, age_seconds=120)
+    await _finish(manager, recent, age_seconds=5)
+
+    assert await manager.expire_finished(ttl=60) == 1
+    assert await manager.get(old) is None
+    assert await manager.get(recent) is not None
+    assert await manager.get(pending) is not None
+
+
+async def test_finished_task_survives_restart(tmp_path, monkeypatch):
+    """Finished tasks are reloaded from SQLite by a new manager."""
+    monkeypatch.setattr(TaskManager, "_execute", _skip_execution)
+    db_path = tmp_path / "tasks.db"
+    manager = TaskManager(Settings(), db_path=db_path)
+    await manager.start()
+    task_id = manager.submit(_request())
+    state = await manager.get(task_id)
+    state.result = TaskResult(
+        image_url="/img", run_id="run_1", description="desc", total_iterations=2
+    )
+    state.status = TaskStatus.COMPLETED
+    state.completed_at = datetime.datetime.now(datetime.timezone.utc)
+    await manager._persist(state)
+    await manager.close()
+
+    restarted = TaskManager(Settings(), db_path=db_path)
+    await restarted.start()
+    try:
+        reloaded = await restarted.get(task_id)
+        assert reloaded.status == TaskStatus.COMPLETED
+        assert reloaded.result.run_id == "run_1"
+        assert reloaded.last_event[0] == "completed"
+    finally:
+        await restarted.close()
+
+
+async def test_running_task_marked_failed_after_restart(tmp_path, monkeypatch):
+    """Tasks left running by a previous process come back as failed."""
+    monkeypatch.setattr(TaskManager, "_execute", _skip_execution)
+    db_path = tmp_path / "tasks.db"
+    manager = TaskManager(Settings(), db_path=db_path)
+    await manager.start()
+    task_id = manager.submit(_request())
+    state = await manager.get(task_id)
+    state.status = TaskStatus.RUNNING
+    await manager._persist(state)
+    await manager.close()
+
+    restarted = TaskManager(Settings(), db_path=db_path)
+    await restarted.start()
+    try:
+        reloaded = await restarted.get(task_id)
+        assert reloaded.status == TaskStatus.FAILED
+        assert "restart" in reloaded.error
+    finally:
+        await restarted.close()
+
+
+async def test_task_ids_are_unique_and_ordered():
+    manager = TaskManager(Settings())
+    ids = [manager.submit(_request()) for _ in range(20)]
+    assert len(set(ids)) == 20
+    assert ids == sorted(ids)
+    assert all(len(task_id) == 12 for task_id in ids)
+
+
+async def test_queued_task_marked_failed_after_restart(tmp_path, monkeypatch):
+    """Tasks still waiting in the queue are persisted and come back as failed."""
+    monkeypatch.setattr(tasks, "_MAX_CONCURRENT", 0)  # no workers: tasks stay queued
+    db_path = tmp_path / "tasks.db"
+    manager = TaskManager(Settings(), db_path=db_path)
+    await manager.start()
+    task_id = manager.submit(_request())
+    await manager.close()
+
+    restarted = TaskManager(Settings(), db_path=db_path)
+    await restarted.start()
+    try:
+        reloaded = await restarted.get(task_id)
+        assert reloaded is not None
+        assert reloaded.status == TaskStatus.FAILED
+        assert "restart" in reloaded.error
+    finally:
+        await restarted.close()
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 
+from PIL import Image
+
 from paperbanana.core.types import DimensionResult
 from paperbanana.evaluation.judge import VLMJudge
 
@@ -210,3 +213,57 @@ def test_aggregate_complete_split():
         "aesthetics": _dim("Model"),
     }
     assert judge._hierarchical_aggregate(results) == "Both are good"
+
+
+class ConcurrentMockVLM(MockVLM):
+    """Mock VLM that records how many calls are in flight at once."""
+
+    def __init__(self, responses: dict[str, str] | None = None):
+        super().__init__(responses)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt, **kwargs):
+        response = await super().generate(prompt, **kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return response
+
+
+async def test_evaluate_runs_dimensions_concurrently(tmp_path):
+    """All four dimensions are judged at once and mapped back by name."""
+    for name in ("model.png", "human.png"):
+        Image.new("RGB", (4, 4)).save(tmp_path / name)
+    vlm = ConcurrentMockVLM(
+        {
+            "faithfulness": json.dumps({"comparison_reasoning": "r", "winner": "Model"}),
+            "readability": json.dumps({"comparison_reasoning": "r", "winner": "Human"}),
+        }
+    )
+    judge = VLMJudge(vlm, prompt_dir="prompts")
+
+    score = await judge.evaluate(
+        image_path=str(tmp_path / "model.png"),
+        source_context="context",
+        caption="caption",
+        reference_path=str(tmp_path / "human.png"),
+    )
+
+    assert vlm.max_in_flight == 4
+    assert score.faithfulness.winner == "Model"
+    assert score.readability.winner == "Human"
+    assert score.conciseness.winner == "Both are good"
+
+
+def test_aggregate_both_are_bad_counts_as_tie():
+    """'Both are bad' is a tie on the primary side, like 'Both are good'."""
+    judge = _make_judge()
+    results = {
+        "faithfulness": _dim("Both are bad"),
+        "readability": _dim("Human"),
+        "conciseness": _dim("Model"),
+        "aesthetics": _dim("Model"),
+    }
+    assert judge._hierarchical_aggregate(results) == "Human"
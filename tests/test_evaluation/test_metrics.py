@@ -0,0 +1,36 @@
+"""Tests for evaluation metric formatting."""
+
+from __future__ import annotations
+
+from paperbanana.core.types import DimensionResult, EvaluationScore
+from paperbanana.evaluation.metrics import format_scores, scores_to_dict
+
+
+def _scores() -> EvaluationScore:
+    return EvaluationScore(
+        faithfulness=DimensionResult(winner="Model", score=100.0, reasoning="accurate"),
+        conciseness=DimensionResult(winner="Human", score=0.0),
+        readability=DimensionResult(winner="Both are good", score=50.0),
+        aesthetics=DimensionResult(winner="Both are bad", score=50.0),
+        overall_winner="Model",
+        overall_score=100.0,
+    )
+
+
+def test_format_scores():
+    assert format_scores(_scores()).splitlines() == [
+        "Faithfulness   Model            (100)",
+        "Conciseness    Human            (0)",
+        "Readability    Both are good    (50)",
+        "Aesthetics     Both are bad     (50)",
+        "Overall        Model            (100)",
+    ]
+
+
+def test_scores_to_dict():
+    flat = scores_to_dict(_scores())
+    assert flat["faithfulness_winner"] == "Model"
+    assert flat["faithfulness_reasoning"] == "accurate"
+    assert flat["conciseness_score"] == 0.0
+    assert flat["overall_winner"] == "Model"
+    assert len(flat) == 4 * 3 + 2
@@ -0,0 +1,26 @@
+"""Tests for configuration loading."""
+
+from __future__ import annotations
+
+from paperbanana.core.config import Settings, _flatten_yaml
+
+
+def test_flatten_yaml_maps_known_keys():
+    """Test that nested keys map to flat settings and unknown keys are ignored."""
+    config = {
+        "vlm": {"provider": "gemini", "base_url": None, "extra": {"model": "x"}},
+        "pipeline": {"refinement_iterations": 2},
+        "output": "not-a-section",
+        "unknown": {"dir": "ignored"},
+    }
+    assert _flatten_yaml(config) == {"vlm_provider": "gemini", "refinement_iterations": 2}
+
+
+def test_from_yaml(tmp_path):
+    """Test loading settings from a YAML file with overrides."""
+    path = tmp_path / "config.yaml"
+    path.write_text("vlm:\n  model: gemini-2.0\nreference:\n  path: refs\n", encoding="utf-8")
+    settings = Settings.from_yaml(path, refinement_iterations=1)
+    assert settings.vlm_model == "gemini-2.0"
+    assert settings.reference_set_path == "refs"
+    assert settings.refinement_iterations == 1
@@ -0,0 +1,28 @@
+"""Tests for guideline loading."""
+
+from __future__ import annotations
+
+import os
+
+from paperbanana.guidelines.methodology import (
+    DEFAULT_METHODOLOGY_GUIDELINES,
+    load_methodology_guidelines,
+)
+from paperbanana.guidelines.plots import DEFAULT_PLOT_GUIDELINES, load_plot_guidelines
+
+
+def test_missing_custom_guidelines_fall_back_to_defaults(tmp_path):
+    assert load_methodology_guidelines(str(tmp_path)) == DEFAULT_METHODOLOGY_GUIDELINES
+    assert load_plot_guidelines(str(tmp_path)) == DEFAULT_PLOT_GUIDELINES
+    assert load_plot_guidelines(None) == DEFAULT_PLOT_GUIDELINES
+
+
+def test_custom_guidelines_are_reread_when_modified(tmp_path):
+    path = tmp_path / "methodology_style_guide.md"
+    path.write_text("first", encoding="utf-8")
+    assert load_methodology_guidelines(str(tmp_path)) == "first"
+
+    path.write_text("second", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_methodology_guidelines(str(tmp_path)) == "second"
@@ -0,0 +1,127 @@
+"""Tests for the generation pipeline's orchestration, with stub agents."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+from PIL import Image
+
+from paperbanana.core.config import Settings
+from paperbanana.core.pipeline import PaperBananaPipeline
+from paperbanana.core.types import CritiqueResult, GenerationInput
+
+
+def _stub(result):
+    async def run(**kwargs):
+        return result(**kwargs) if callable(result) else result
+
+    return SimpleNamespace(run=run, clear_prompt_cache=lambda: None)
+
+
+def _pipeline(tmp_path, image_gen=None, **settings) -> PaperBananaPipeline:
+    pipeline = PaperBananaPipeline(
+        settings=Settings(
+            output_dir=str(tmp_path / "outputs"),
+            reference_set_path=str(tmp_path / "references"),
+            refinement_iterations=1,
+            **settings,
+        ),
+        vlm_client=SimpleNamespace(name="stub"),
+        image_gen_fn=image_gen,
+    )
+    image_path = tmp_path / "rendered.png"
+    Image.new("RGB", (4, 4)).save(image_path)
+
+    pipeline.retriever = _stub([])
+    pipeline.planner = _stub("description")
+    pipeline.stylist = _stub("styled")
+    pipeline.visualizer = _stub(str(image_path))
+    pipeline.critic = _stub(CritiqueResult())
+    return pipeline
+
+
+def _input() -> GenerationInput:
+    return GenerationInput(source_context="context", communicative_intent="caption")
+
+
+def test_edited_guidelines_are_used_by_the_next_run(tmp_path):
+    guidelines_dir = tmp_path / "guidelines"
+    guidelines_dir.mkdir()
+    guide = guidelines_dir / "methodology_style_guide.md"
+    guide.write_text("first", encoding="utf-8")
+
+    pipeline = _pipeline(tmp_path, guidelines_path=str(guidelines_dir))
+    seen = []
+    pipeline.stylist = _stub(lambda **kwargs: seen.append(kwargs["guidelines"]) or "styled")
+
+    asyncio.run(pipeline.generate(_input()))
+    guide.write_text("second", encoding="utf-8")
+    st = guide.stat()
+    os.utime(guide, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    pipeline.new_run()
+    asyncio.run(pipeline.generate(_input()))
+
+    assert seen == ["first", "second"]
+
+
+def test_failed_stage_settles_background_tasks(tmp_path):
+    async def preconnect():
+        await asyncio.sleep(3600)
+
+    async def critic_fails(**kwargs):
+        raise RuntimeError("provider error")
+
+    pipeline = _pipeline(tmp_path, image_gen=SimpleNamespace(preconnect=preconnect))
+    pipeline.critic = SimpleNamespace(run=critic_fails, clear_prompt_cache=lambda: None)
+
+    async def run():
+        try:
+            await pipeline.generate(_input())
+        except RuntimeError as e:
+            assert str(e) == "provider error"
+        else:
+            raise AssertionError("generate should have raised")
+        # Neither the hanging preconnect nor the artifact writes are left behind
+        assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    asyncio.run(run())
+    assert (pipeline._run_dir / "planning.json").exists()
+
+
+def test_config_snapshot_keeps_defaults_and_drops_api_keys(tmp_path):
+    pipeline = _pipeline(tmp_path, google_api_key="secret", kie_api_key="secret")
+    output = asyncio.run(pipeline.generate(_input()))
+
+    snapshot = output.metadata["config_snapshot"]
+    assert snapshot["vlm_model"] == Settings().vlm_model
+    assert snapshot["output_resolution"] == Settings().output_resolution
+    assert not [key for key in snapshot if key.endswith("_api_key")]
+
+
+def test_failed_preconnect_does_not_fail_the_run(tmp_path):
+    async def preconnect():
+        raise RuntimeError("client closed")
+
+    pipeline = _pipeline(tmp_path, image_gen=SimpleNamespace(preconnect=preconnect))
+    output = asyncio.run(pipeline.generate(_input()))
+    assert os.path.exists(output.image_path)
+
+
+def test_artifacts_are_written_together_at_the_end(tmp_path):
+    pipeline = _pipeline(tmp_path)
+    written_during_run = []
+
+    async def critique(**kwargs):
+        # Long enough for a background write of planning.json to land
+        await asyncio.sleep(0.2)
+        written_during_run.extend(pipeline._run_dir.glob("**/*.json"))
+        return CritiqueResult()
+
+    pipeline.critic = SimpleNamespace(run=critique, clear_prompt_cache=lambda: None)
+    asyncio.run(pipeline.generate(_input()))
+
+    assert written_during_run == []
+    for name in ("planning.json", "iter_1/details.json", "metadata.json"):
+        assert (pipeline._run_dir / name).exists()
@@ -75,7 +75,10 @@ def test_get_by_category():
 
         store = ReferenceStore(tmpdir)
         agents = store.get_by_category("agent")
-        assert len(agents) == 2
+        assert [e.id for e in agents] == ["r1", "r3"]
+        agents.clear()
+        assert len(store.get_by_category("agent")) == 2
+        assert store.get_by_category("missing") == []
 
 
 def test_get_by_id():
@@ -107,6 +110,26 @@ def test_create_store():
 
         store = ReferenceStore.create(tmpdir, examples, metadata={"name": "new"})
         assert store.count == 1
+        assert store.get_by_id("new_001") is examples[0]
 
         # Verify file was created
         assert Path(tmpdir, "index.json").exists()
+
+
+def test_concurrent_first_load_reads_index_once():
+    """Test that threads racing on a fresh store load it only once."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = {
+            "examples": [
+                {"id": f"r{i}", "source_context": "c", "caption": "c", "image_path": "i"}
+                for i in range(50)
+            ],
+        }
+        Path(tmpdir, "index.json").write_text(json.dumps(data))
+
+        store = ReferenceStore(tmpdir)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            counts = list(pool.map(lambda _: store.count, range(16)))
+        assert counts == [50] * 16
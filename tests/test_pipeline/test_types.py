@@ -47,6 +47,21 @@ def test_reference_example():
     assert ref.id == "ref_001"
 
 
+def test_reference_example_excerpt():
+    """Test ReferenceExample excerpts are truncated and reused."""
+    ref = ReferenceExample(
+        id="ref_001",
+        source_context="abcdefghij",
+        caption="Caption",
+        image_path="path/to/image.png",
+    )
+    assert ref.excerpt(4) == "abcd"
+    assert ref.excerpt(4) is ref.excerpt(4)
+    assert ref.excerpt(50) == "abcdefghij"
+    with pytest.raises(Exception):
+        ref.source_context = "changed"
+
+
 def test_critique_result():
     """Test CritiqueResult creation with suggestions."""
     cr = CritiqueResult(
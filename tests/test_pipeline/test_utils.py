@@ -0,0 +1,90 @@
+"""Tests for shared utility functions."""
+
+from __future__ import annotations
+
+import base64
+import os
+import re
+
+from PIL import Image
+
+from paperbanana.core.utils import (
+    base64_to_image,
+    bytes_to_image,
+    generate_run_id,
+    hash_content,
+    image_to_base64,
+    image_to_bytes,
+    load_image,
+    load_json,
+    save_json,
+    truncate_text,
+    truncate_text_join,
+)
+
+
+def test_load_image_reuses_decoded_image(tmp_path):
+    path = tmp_path / "figure.png"
+    Image.new("RGB", (4, 4), "red").save(path)
+
+    first = load_image(path)
+    assert load_image(str(path)) is first
+
+
+def test_load_image_reloads_after_file_changes(tmp_path):
+    path = tmp_path / "figure.png"
+    Image.new("RGB", (4, 4), "red").save(path)
+    first = load_image(path)
+
+    Image.new("RGB", (8, 8), "blue").save(path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    second = load_image(path)
+    assert second is not first
+    assert second.size == (8, 8)
+
+
+def test_image_to_base64_round_trip():
+    image = Image.new("RGB", (16, 8), "red")
+    decoded = base64_to_image(image_to_base64(image))
+    assert decoded.format == "PNG"
+    assert decoded.size == (16, 8)
+    assert decoded.convert("RGB").getpixel((0, 0)) == (255, 0, 0)
+
+    raw = image_to_bytes(image)
+    assert raw.startswith(b"\x89PNG")
+    assert base64_to_image(base64.b64encode(raw)).size == (16, 8)
+    assert bytes_to_image(raw).size == (16, 8)
+
+
+def test_truncate_text_join_matches_truncate_text():
+    parts = ["abc", "defg", "hij"]
+    for max_chars in (4, 7, 10, 20):
+        assert truncate_text_join(parts, max_chars) == truncate_text("".join(parts), max_chars)
+
+    def endless():
+        while True:
+            yield "x" * 10
+
+    assert truncate_text_join(endless(), 25) == "x" * 22 + "..."
+
+
+def test_hash_content_is_short_and_stable():
+    digest = hash_content("methodology")
+    assert len(digest) == 12
+    assert hash_content(b"methodology") == digest
+    assert hash_content("methodology.") != digest
+
+
+def test_save_json_round_trip(tmp_path):
+    path = tmp_path / "nested" / "data.json"
+    save_json({"text": "naïve", "items": [1, 2], "path": tmp_path, 3: None}, path)
+    assert load_json(path) == {"text": "naïve", "items": [1, 2], "path": str(tmp_path), "3": None}
+    assert path.read_text(encoding="utf-8").startswith('{\n  "text"')
+
+
+def test_generate_run_id_format():
+    run_id = generate_run_id()
+    assert re.fullmatch(r"run_\d{8}_\d{6}_[0-9a-f]{6}", run_id)
+    assert generate_run_id() != run_id
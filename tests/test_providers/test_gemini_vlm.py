@@ -0,0 +1,31 @@
+"""Tests for the Gemini VLM provider."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from google.genai import types
+from PIL import Image
+
+from paperbanana.providers.vlm.gemini import GeminiVLM
+
+
+def test_generate_uses_async_sdk_surface():
+    calls = []
+
+    async def generate_content(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(text="ok", usage_metadata=None)
+
+    vlm = GeminiVLM(api_key="key", image_format="jpeg")
+    vlm._client = SimpleNamespace(
+        aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+    )
+    text = asyncio.run(vlm.generate("describe", images=[Image.new("RGB", (4, 4))]))
+
+    assert text == "ok"
+    image_part, prompt = calls[0]["contents"]
+    assert isinstance(image_part, types.Part)
+    assert image_part.inline_data.mime_type == "image/jpeg"
+    assert prompt == "describe"
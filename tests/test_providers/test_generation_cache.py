@@ -0,0 +1,37 @@
+"""Tests for the seeded image generation cache."""
+
+from __future__ import annotations
+
+from PIL import Image
+
+from paperbanana.providers.image_gen._cache import GenerationCache
+
+
+def test_only_seeded_requests_are_cached():
+    cache = GenerationCache(maxsize=2)
+    image = Image.new("RGB", (4, 4))
+
+    unseeded = cache.key("p", None, 4, 4, None)
+    cache.put(unseeded, image)
+    assert cache.get(unseeded) is None
+
+    seeded = cache.key("p", None, 4, 4, 1)
+    cache.put(seeded, image)
+    hit = cache.get(seeded)
+    hit.putpixel((0, 0), (255, 0, 0))
+    assert cache.get(seeded).getpixel((0, 0)) == (0, 0, 0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = GenerationCache(maxsize=2)
+    image = Image.new("RGB", (4, 4))
+    keys = [cache.key(str(i), None, 4, 4, 0) for i in range(3)]
+
+    cache.put(keys[0], image)
+    cache.put(keys[1], image)
+    cache.get(keys[0])
+    cache.put(keys[2], image)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
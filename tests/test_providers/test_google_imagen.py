@@ -0,0 +1,45 @@
+"""Tests for the Google Imagen provider's response handling."""
+
+from __future__ import annotations
+
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+from google.genai import types
+from PIL import Image
+
+from paperbanana.providers.image_gen.google_imagen import GoogleImagenGen
+
+
+def test_generate_skips_text_parts_and_returns_pil_image():
+    buffer = BytesIO()
+    Image.new("RGB", (6, 3)).save(buffer, format="PNG")
+    response = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(
+                    parts=[
+                        types.Part(text="Here is your figure."),
+                        types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/png"),
+                    ]
+                )
+            )
+        ]
+    )
+
+    gen = GoogleImagenGen(api_key="key")
+    gen._client = SimpleNamespace(
+        models=SimpleNamespace(generate_content=lambda **kwargs: response)
+    )
+    image = asyncio.run(gen.generate("prompt"))
+    assert isinstance(image, Image.Image)
+    assert image.size == (6, 3)
+
+
+def test_image_dims():
+    gen = GoogleImagenGen(api_key="key")
+    assert gen._image_dims(1024, 1024) == ("1:1", "1K")
+    assert gen._image_dims(1792, 1024) == ("16:9", "2K")
+    assert gen._image_dims(1200, 1000) == ("1:1", "2K")
+    assert gen._image_dims(1024, 4096) == ("9:16", "4K")
@@ -0,0 +1,105 @@
+"""Tests for the NanoBanana image generation provider."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from io import BytesIO
+
+import httpx
+from PIL import Image
+
+from paperbanana.providers.image_gen import nanobanana
+from paperbanana.providers.image_gen.nanobanana import NanoBananaImageGen
+
+
+def _png(width: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, 4)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    """Fake kie.ai API: task IDs and result URLs echo the prompt's width."""
+    if request.url.path.endswith("/jobs/createTask"):
+        prompt = json.loads(request.content)["input"]["prompt"]
+        return httpx.Response(200, json={"data": {"taskId": prompt}})
+    if request.url.path.endswith("/jobs/recordInfo"):
+        task_id = request.url.params["taskId"]
+        result = {"resultUrls": [f"https://files.example/{task_id}.png"]}
+        return httpx.Response(
+            200, json={"data": {"state": "success", "resultJson": json.dumps(result)}}
+        )
+    width = int(request.url.path.rsplit("/", 1)[1].removesuffix(".png"))
+    return httpx.Response(200, content=_png(width))
+
+
+def test_poll_task_backs_off_until_success(monkeypatch):
+    polls = []
+    delays = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        polls.append(request)
+        if len(polls) < 4:
+            return httpx.Response(200, json={"data": {"state": "generating"}})
+        result = json.dumps({"resultUrls": ["https://files.example/a.png"]})
+        return httpx.Response(200, json={"data": {"state": "success", "resultJson": result}})
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(nanobanana.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(nanobanana, "_POLL_JITTER", 0.0)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            gen = NanoBananaImageGen(api_key="key", http_client=client)
+            return await gen._poll_task("task")
+
+    assert asyncio.run(_run()) == ["https://files.example/a.png"]
+    assert delays == [nanobanana._INITIAL_DELAY, 1.0, 1.5, 2.25]
+
+
+def test_image_size_bands_exclude_their_lower_threshold():
+    gen = NanoBananaImageGen(api_key="key")
+    assert gen._image_size(1024, 1024) == "1:1"
+    assert gen._image_size(1500, 1000) == "3:2"
+    assert gen._image_size(1501, 1000) == "16:9"
+    assert gen._image_size(3000, 1000) == "21:9"
+    assert gen._image_size(500, 1000) == "9:16"
+
+
+def test_preconnect_opens_connection_and_swallows_errors():
+    methods = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        raise httpx.ConnectError("unreachable", request=request)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await NanoBananaImageGen(api_key="key", http_client=client).preconnect()
+
+    asyncio.run(_run())
+    assert methods == ["HEAD"]
+
+
+def test_seeded_requests_are_not_cached(monkeypatch):
+    """The task API takes no seed, so a repeated seeded request is a new sample."""
+    monkeypatch.setattr(nanobanana, "_INITIAL_DELAY", 0.0)
+    created = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/jobs/createTask"):
+            created.append(json.loads(request.content))
+        return _handler(request)
+
+    async def _run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            gen = NanoBananaImageGen(api_key="key", http_client=client)
+            await gen.generate("4", seed=1)
+            await gen.generate("4", seed=1)
+
+    asyncio.run(_run())
+    assert len(created) == 2
+    assert all("seed" not in body["input"] for body in created)
@@ -42,3 +42,101 @@ def test_unknown_image_provider_raises():
     settings = Settings(image_provider="nonexistent")
     with pytest.raises(ValueError, match="Unknown image provider"):
         ProviderRegistry.create_image_gen(settings)
+
+
+async def test_http_providers_share_client():
+    """Test that HTTP-based providers reuse a shared client and leave it open."""
+    from paperbanana.providers.http import create_http_client
+
+    settings = Settings(
+        vlm_provider="openrouter",
+        image_provider="nanobanana",
+        openrouter_api_key="test-key",
+        kie_api_key="test-key",
+    )
+    client = create_http_client()
+    vlm = ProviderRegistry.create_vlm(settings, http_client=client)
+    gen = ProviderRegistry.create_image_gen(settings, http_client=client)
+    assert vlm._get_client() is client
+    assert gen._get_client() is client
+
+    await vlm.aclose()
+    await gen.aclose()
+    assert not client.is_closed
+    await client.aclose()
+
+
+async def test_gemini_client_closes_without_async_client():
+    """Test that the genai API client tolerates aclose() before async use."""
+    from paperbanana.providers._patched_client import SafeBaseApiClient
+
+    settings = Settings(vlm_provider="gemini", google_api_key="test-key")
+    vlm = ProviderRegistry.create_vlm(settings)
+    api_client = vlm._get_client()._api_client
+    assert isinstance(api_client, SafeBaseApiClient)
+    await api_client.aclose()
+    await vlm.aclose()
+
+
+def test_gemini_client_honours_skip_ssl_verification():
+    """Test that skipping SSL verification is applied to the genai client itself."""
+    import ssl
+
+    settings = Settings(
+        vlm_provider="gemini", google_api_key="test-key", SKIP_SSL_VERIFICATION=True
+    )
+    vlm = ProviderRegistry.create_vlm(settings)
+    pool = vlm._get_client()._api_client._httpx_client._transport._pool
+    assert pool._ssl_context.verify_mode == ssl.CERT_NONE
+
+
+async def test_openrouter_vlm_sends_configured_image_format():
+    """Test that vlm_image_format selects the encoding of uploaded images."""
+    import json
+
+    import httpx
+    from PIL import Image
+
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    settings = Settings(
+        vlm_provider="openrouter", openrouter_api_key="test-key", vlm_image_format="jpeg"
+    )
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        vlm = ProviderRegistry.create_vlm(settings, http_client=client)
+        await vlm.generate("describe", images=[Image.new("RGBA", (8, 8), "red")])
+
+    url = sent[0]["messages"][0]["content"][0]["image_url"]["url"]
+    assert url.startswith("data:image/jpeg;base64,/9j/")
+
+
+def test_mask_key():
+    """Test that logged API keys keep only their ends."""
+    from paperbanana.providers.registry import _mask_key
+
+    assert _mask_key(None) == "(empty)"
+    assert _mask_key("short-key") == "(short)"
+    assert _mask_key("sk-abcdefghijklmnop") == "sk-abcde...mnop"
+
+
+async def test_openrouter_vlm_does_not_retry_client_errors():
+    """Test that a permanent 4xx fails on the first attempt."""
+    import httpx
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(401, json={"error": "invalid key"})
+
+    settings = Settings(vlm_provider="openrouter", openrouter_api_key="bad-key")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        vlm = ProviderRegistry.create_vlm(settings, http_client=client)
+        with pytest.raises(httpx.HTTPStatusError):
+            await vlm.generate("describe")
+
+    assert len(calls) == 1